@@ -0,0 +1,235 @@
+import random
+import time
+from datetime import datetime, timedelta, time as dtime
+from itertools import islice
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import SupervisorAssignment
+from applications.models import Program, Application, ApplicationStatusHistory
+from attendance.models import AttendanceRecord
+from leave.models import LeaveType, LeaveRequest, LeaveRequestHistory
+from leave.utils import rebuild_leave_ledger
+from notifications.models import Notification
+from reports.metrics import refresh_daily_metrics
+from reviews.models import Review
+from tasks.models import Task, TaskComment
+
+User = get_user_model()
+
+EMAIL_DOMAIN = 'load.test'
+PROGRAM_DESCRIPTION = 'Generated by generate_load_data'
+
+LEAVE_TYPES = [
+    ('Annual Leave', 10),
+    ('Sick Leave', 5),
+    ('Compassionate Leave', 3),
+]
+
+# Status path a leave request walks through, keyed by its final status
+LEAVE_HISTORY = {
+    'pending': ['pending'],
+    'supervisor_approved': ['pending', 'supervisor_approved'],
+    'approved': ['pending', 'supervisor_approved', 'approved'],
+    'rejected': ['pending', 'rejected'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic load-testing dataset (users, attendance, tasks, leave, reviews, notifications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1000,
+                            help='Number of interns; every other volume is derived from it')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Days of attendance history to generate')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--password', default='LoadTest123',
+                            help='Password shared by every generated account')
+        parser.add_argument('--seed', type=int, default=1234)
+        parser.add_argument('--clear', action='store_true',
+                            help=f'Delete previously generated @{EMAIL_DOMAIN} accounts first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.today = timezone.localdate()
+        self.counts = {}
+        started = time.perf_counter()
+
+        if options['clear']:
+            deleted, _ = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+            Program.objects.filter(description=PROGRAM_DESCRIPTION).delete()
+            self.stdout.write(self.style.WARNING(f'Removed {deleted} previously generated rows'))
+
+        with transaction.atomic():
+            self.generate(options['scale'], options['days'], options['password'])
+
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f'  {label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {total} rows in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def bulk(self, model, objects, keep=False):
+        """bulk_create an iterable in batches; return the created objects when keep=True."""
+        created = []
+        objects = iter(objects)
+        count = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            batch = model.objects.bulk_create(batch)
+            count += len(batch)
+            if keep:
+                created.extend(batch)
+        label = model._meta.verbose_name_plural
+        self.counts[label] = self.counts.get(label, 0) + count
+        return created
+
+    def generate(self, scale, days, password):
+        rng, today = self.rng, self.today
+        # Hash once and share the digest, so user creation costs no hashing per row
+        password_hash = make_password(password)
+        run = timezone.now().strftime('%H%M%S')
+
+        programs = self.bulk(Program, (
+            Program(name=f'Load Program {i}', program_type='IT' if i % 2 else 'NYSC',
+                    description=PROGRAM_DESCRIPTION, duration_months=12,
+                    start_date=today - timedelta(days=days), end_date=today + timedelta(days=180),
+                    application_deadline=today - timedelta(days=days + 14))
+            for i in range(max(3, scale // 200))
+        ), keep=True)
+
+        def user(role, i):
+            return User(username=f'load_{run}_{role}{i}', email=f'{role}{i}.{run}@{EMAIL_DOMAIN}',
+                        password=password_hash, first_name=role.title(), last_name=f'{i}', role=role)
+
+        admins = self.bulk(User, (user('admin', i) for i in range(3 + scale // 500)), keep=True)
+        supervisors = self.bulk(User, (user('supervisor', i) for i in range(max(1, scale // 20))), keep=True)
+        interns = self.bulk(User, (user('intern', i) for i in range(scale)), keep=True)
+
+        program_of = {intern.id: programs[i % len(programs)] for i, intern in enumerate(interns)}
+        supervisor_of = {intern.id: supervisors[i % len(supervisors)] for i, intern in enumerate(interns)}
+
+        self.bulk(SupervisorAssignment, (
+            SupervisorAssignment(supervisor=supervisor_of[intern.id], intern=intern,
+                                 program=program_of[intern.id], assigned_by=admins[0])
+            for intern in interns
+        ))
+
+        applications = self.bulk(Application, (
+            Application(applicant=intern, program=program_of[intern.id],
+                        status=rng.choices(['approved', 'pending', 'under_review', 'rejected'], [85, 5, 5, 5])[0],
+                        cover_letter='Generated cover letter', why_interested='Generated',
+                        skills_and_experience='Generated', availability_start_date=today - timedelta(days=days),
+                        reviewed_by=admins[0])
+            for intern in interns
+        ), keep=True)
+        self.bulk(ApplicationStatusHistory, (
+            ApplicationStatusHistory(application=app, status=app_status, changed_by=admins[0])
+            for app in applications
+            for app_status in (['pending'] if app.status == 'pending' else ['pending', app.status])
+        ))
+
+        # Weekdays only, plus today so there are live check-ins to look at
+        workdays = [today - timedelta(days=d) for d in range(days)
+                    if d == 0 or (today - timedelta(days=d)).weekday() < 5]
+        self.bulk(AttendanceRecord, self.attendance(interns, workdays))
+
+        tasks = self.bulk(Task, self.tasks(interns, program_of, supervisor_of, days), keep=True)
+        self.bulk(TaskComment, (
+            TaskComment(task=task, author=rng.choice([task.assigned_to, task.assigned_by]),
+                        comment='Generated comment')
+            for task in tasks for _ in range(rng.randint(0, 3))
+        ))
+
+        leave_types = [LeaveType.objects.get_or_create(name=name, defaults={'max_days_per_year': max_days})[0]
+                       for name, max_days in LEAVE_TYPES]
+        leave_requests = self.bulk(LeaveRequest, self.leave_requests(interns, leave_types, supervisor_of, admins, days), keep=True)
+        # bulk_create bypasses the review actions that keep the ledger in step
+        rebuild_leave_ledger()
+        self.bulk(LeaveRequestHistory, (
+            LeaveRequestHistory(leave_request=leave, status=leave_status,
+                                changed_by={'pending': leave.applicant,
+                                            'approved': leave.reviewed_by}.get(leave_status, leave.supervisor_reviewed_by))
+            for leave in leave_requests for leave_status in LEAVE_HISTORY[leave.status]
+        ))
+
+        quarters = max(1, days // 90)
+        self.bulk(Review, (
+            Review(intern=intern, reviewer=supervisor_of[intern.id], program=program_of[intern.id],
+                   period_start=today - timedelta(days=90 * (q + 1)), period_end=today - timedelta(days=90 * q),
+                   overall_rating=rng.randint(1, 5), technical_skills=rng.randint(1, 5),
+                   communication=rng.randint(1, 5), teamwork=rng.randint(1, 5),
+                   initiative=rng.randint(1, 5), punctuality=rng.randint(1, 5),
+                   status='draft' if q == 0 else rng.choice(['submitted', 'acknowledged']),
+                   submitted_at=None if q == 0 else timezone.now() - timedelta(days=90 * q))
+            for intern in interns for q in range(quarters)
+        ))
+
+        self.bulk(Notification, (
+            Notification(recipient=recipient, title=f'Generated notification {n}',
+                         message='Generated notification body',
+                         notification_type=rng.choice(['task_assignment', 'leave_request', 'review', 'reminder']),
+                         is_read=rng.random() < 0.7)
+            for recipient in admins + supervisors + interns for n in range(10)
+        ))
+
+        # Reports read the DailyMetric rollup, which bulk_create never fills
+        self.counts['daily metrics'] = refresh_daily_metrics(full=True)
+
+    def attendance(self, interns, workdays):
+        rng = self.rng
+        for intern in interns:
+            for day in workdays:
+                roll = rng.random()
+                if roll < 0.05:
+                    yield AttendanceRecord(user=intern, date=day, status='absent')
+                    continue
+                late = roll < 0.15
+                yield AttendanceRecord(
+                    user=intern, date=day, status='late' if late else 'present',
+                    check_in=dtime(9, rng.randint(0, 59)) if late else dtime(8, 30),
+                    check_out=None if day == self.today else dtime(17, 0),
+                )
+
+    def tasks(self, interns, program_of, supervisor_of, days):
+        rng, today = self.rng, self.today
+        for intern in interns:
+            for n in range(6):
+                task_status = rng.choices(['completed', 'todo', 'in_progress', 'overdue'], [60, 15, 15, 10])[0]
+                due_date = today + timedelta(days=rng.randint(-days, 30))
+                yield Task(
+                    title=f'Task {n}', description='Generated task', assigned_to=intern,
+                    assigned_by=supervisor_of[intern.id], program=program_of[intern.id],
+                    due_date=due_date, priority=rng.choice(['low', 'medium', 'high']),
+                    status=task_status,
+                    completed_at=timezone.make_aware(datetime.combine(min(due_date, today), dtime(16, 0)))
+                    if task_status == 'completed' else None,
+                )
+
+    def leave_requests(self, interns, leave_types, supervisor_of, admins, days):
+        rng, today = self.rng, self.today
+        for intern in interns:
+            # One request per slot of the window, so no two of an intern's requests overlap
+            requests = rng.randint(2, 4)
+            slot = (days + 61) // requests
+            for n in range(requests):
+                length = rng.randint(0, min(4, slot - 1))
+                start = today + timedelta(days=-days + n * slot + rng.randint(0, slot - 1 - length))
+                leave_status = rng.choices(list(LEAVE_HISTORY), [10, 10, 60, 20])[0]
+                reviewed = leave_status != 'pending'
+                yield LeaveRequest(
+                    applicant=intern, leave_type=rng.choice(leave_types),
+                    start_date=start, end_date=start + timedelta(days=length),
+                    reason='Generated leave request', status=leave_status,
+                    supervisor_reviewed_by=supervisor_of[intern.id] if reviewed else None,
+                    supervisor_reviewed_at=timezone.now() if reviewed else None,
+                    reviewed_by=admins[0] if leave_status == 'approved' else None,
+                    reviewed_at=timezone.now() if leave_status == 'approved' else None,
+                )
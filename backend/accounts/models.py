@@ -22,6 +22,10 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        # Admin user list ordering (list_users)
+        indexes = [models.Index(fields=['-created_at', '-id'], name='user_created_keyset')]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
 
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import SupervisorAssignment
+from .utils import invalidate_supervisor_scope
+
+
+@receiver(post_save, sender=SupervisorAssignment)
+@receiver(post_delete, sender=SupervisorAssignment)
+def supervisor_assignment_changed(sender, instance, **kwargs):
+    # Covers deletes cascaded from users and programs too
+    invalidate_supervisor_scope(instance.supervisor_id, instance.intern_id)
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from .models import SupervisorAssignment
+
+SUPERVISOR_SCOPE_CACHE_PREFIX = 'accounts:scope:'
+
+
+def _scope_cache_key(supervisor_id):
+    return f'{SUPERVISOR_SCOPE_CACHE_PREFIX}{supervisor_id}'
+
+
+def get_supervised_intern_ids(supervisor):
+    """Return the frozenset of intern ids assigned to a supervisor (cached).
+
+    Entries are dropped by invalidate_supervisor_scope whenever an assignment
+    is saved or deleted in this process (in every process with a shared
+    cache); SUPERVISOR_SCOPE_CACHE_TIMEOUT bounds staleness elsewhere and for
+    bulk writes that bypass signals.
+    """
+    supervisor_id = getattr(supervisor, 'pk', supervisor)
+    key = _scope_cache_key(supervisor_id)
+    intern_ids = cache.get(key)
+    if intern_ids is None:
+        intern_ids = sorted(set(SupervisorAssignment.objects.filter(
+            supervisor_id=supervisor_id
+        ).values_list('intern_id', flat=True)))
+        cache.set(key, intern_ids, settings.SUPERVISOR_SCOPE_CACHE_TIMEOUT)
+    return frozenset(intern_ids)
+
+
+def _supervisors_cache_key(intern_id):
+    return f'{SUPERVISOR_SCOPE_CACHE_PREFIX}intern:{intern_id}'
+
+
+def get_intern_supervisor_ids(intern):
+    """Return the frozenset of supervisor ids assigned to an intern (cached, reverse of the scope)."""
+    intern_id = getattr(intern, 'pk', intern)
+    key = _supervisors_cache_key(intern_id)
+    supervisor_ids = cache.get(key)
+    if supervisor_ids is None:
+        supervisor_ids = sorted(set(SupervisorAssignment.objects.filter(
+            intern_id=intern_id
+        ).values_list('supervisor_id', flat=True)))
+        cache.set(key, supervisor_ids, settings.SUPERVISOR_SCOPE_CACHE_TIMEOUT)
+    return frozenset(supervisor_ids)
+
+
+def supervises(supervisor, intern):
+    """True if the supervisor is assigned to the intern.
+
+    Fallback: a supervisor with no assignments at all may act on any intern,
+    so the system is usable before assignments are created.
+    """
+    intern_ids = get_supervised_intern_ids(supervisor)
+    return not intern_ids or getattr(intern, 'pk', intern) in intern_ids
+
+
+def invalidate_supervisor_scope(supervisor_id, intern_id=None):
+    keys = [_scope_cache_key(supervisor_id)]
+    if intern_id is not None:
+        keys.append(_supervisors_cache_key(intern_id))
+    cache.delete_many(keys)
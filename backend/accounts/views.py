@@ -2,13 +2,16 @@ from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
+from rest_framework.pagination import PageNumberPagination
 from django.contrib.auth import login, logout
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
+from intern_management.authentication import invalidate_token, invalidate_user_tokens
 from intern_management.permissions import IsAdmin, IsAdminOrSupervisor
 from .models import User, Profile, PasswordResetToken, SupervisorAssignment
+from .utils import get_supervised_intern_ids
 from .serializers import (
     UserSerializer, UserListSerializer, UserRoleUpdateSerializer,
     RegistrationSerializer, LoginSerializer, PasswordChangeSerializer,
@@ -68,6 +71,7 @@ def login_view(request):
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
     try:
+        invalidate_token(request.user.auth_token.key)
         request.user.auth_token.delete()
     except Exception:
         pass
@@ -83,9 +87,13 @@ def profile(request):
         return Response(serializer.data)
 
     elif request.method == 'PUT':
-        serializer = UserSerializer(request.user, data=request.data, partial=True)
+        # request.user may be a cached snapshot; save over the current row so
+        # stale role/is_active values are never written back
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UserSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            invalidate_user_tokens(user)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -117,23 +125,45 @@ def change_password(request):
     if serializer.is_valid():
         user = request.user
         user.set_password(serializer.validated_data['new_password'])
-        user.save()
+        # Only the password: the rest of a cached request.user may be stale
+        user.save(update_fields=['password'])
+        invalidate_user_tokens(user)
         return Response({'message': 'Password changed successfully'}, status=status.HTTP_200_OK)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 # ==================== User Management (Admin) ====================
 
+class UserListPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
 @api_view(['GET'])
 @permission_classes([IsAdmin])
 def list_users(request):
-    """List all users (admin only)"""
-    users = User.objects.all().order_by('-created_at')
+    """List users, paginated (admin only).
+
+    Query params: search (first/last name or email), role, is_active,
+    page and page_size. Rows are read with values() and returned as-is,
+    skipping model instances and the serializer.
+    """
+    users = User.objects.order_by('-created_at', '-id')
     role_filter = request.query_params.get('role')
     if role_filter:
         users = users.filter(role=role_filter)
-    serializer = UserListSerializer(users, many=True)
-    return Response(serializer.data)
+    is_active = request.query_params.get('is_active')
+    if is_active in ('true', 'false'):
+        users = users.filter(is_active=is_active == 'true')
+    search = request.query_params.get('search', '').strip()
+    if search:
+        users = users.filter(
+            Q(first_name__icontains=search) | Q(last_name__icontains=search) | Q(email__icontains=search)
+        )
+
+    paginator = UserListPagination()
+    page = paginator.paginate_queryset(users.values(*UserListSerializer.Meta.fields), request)
+    return paginator.get_paginated_response(page)
 
 
 @api_view(['PUT'])
@@ -148,6 +178,7 @@ def update_user_role(request, user_id):
     serializer = UserRoleUpdateSerializer(user, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        invalidate_user_tokens(user)
         return Response(UserSerializer(user).data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -166,6 +197,7 @@ def deactivate_user(request, user_id):
 
     user.is_active = not user.is_active
     user.save()
+    invalidate_user_tokens(user)
     status_text = 'deactivated' if not user.is_active else 'activated'
     return Response({'message': f'User {status_text} successfully'})
 
@@ -211,9 +243,7 @@ def my_supervisor_interns(request):
         interns = User.objects.filter(role='intern', is_active=True).order_by('first_name', 'last_name')
     else:
         # Get intern IDs from supervisor assignments
-        intern_ids = SupervisorAssignment.objects.filter(
-            supervisor=request.user
-        ).values_list('intern_id', flat=True)
+        intern_ids = get_supervised_intern_ids(request.user)
 
         if intern_ids:
             interns = User.objects.filter(
@@ -248,31 +278,10 @@ def password_reset_request(request):
                 )
 
                 reset_url = f"{settings.FRONTEND_URL}/reset-password/{reset_token.token}/"
-                subject = "Password Reset Request - Intern Management System"
-                message = f"""
-Hello {user.first_name},
-
-You requested a password reset for your Intern Management System account.
-
-Click the link below to reset your password:
-{reset_url}
-
-This link will expire in 1 hour for security reasons.
-
-If you didn't request this password reset, please ignore this email.
-
-Best regards,
-Intern Management System Team
-                """
-
-                try:
-                    send_mail(
-                        subject=subject, message=message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[email], fail_silently=False,
-                    )
-                except Exception:
-                    pass
+                # Sent in the background so SMTP latency never holds the request
+                from notifications.utils import defer_task
+                defer_task('notifications.tasks.send_password_reset_email_task',
+                           user.id, str(reset_token.token), reset_url)
 
             except User.DoesNotExist:
                 pass
@@ -302,6 +311,7 @@ def password_reset_confirm(request):
         user.set_password(new_password)
         user.save()
         reset_token.expire()
+        invalidate_user_tokens(user)
         Token.objects.filter(user=user).delete()
 
         return Response({
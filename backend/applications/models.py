@@ -47,6 +47,8 @@ class Application(models.Model):
     
     class Meta:
         unique_together = ['applicant', 'program']
+        # Status filter (optionally by program) on the application list and admin reports
+        indexes = [models.Index(fields=['status', 'program'], name='application_status_program')]
     
     def __str__(self):
         return f"{self.applicant.username} - {self.program.name}"
@@ -24,19 +24,26 @@ class ApplicationStatusHistorySerializer(serializers.ModelSerializer):
 
 class ApplicationSerializer(serializers.ModelSerializer):
     applicant_name = serializers.CharField(source='applicant.get_full_name', read_only=True)
+    applicant_email = serializers.EmailField(source='applicant.email', read_only=True)
     program_name = serializers.CharField(source='program.name', read_only=True)
     status_history = ApplicationStatusHistorySerializer(many=True, read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.get_full_name', read_only=True)
     
     class Meta:
         model = Application
-        fields = ['id', 'applicant', 'applicant_name', 'program', 'program_name', 
+        fields = ['id', 'applicant', 'applicant_name', 'applicant_email', 'program', 'program_name', 
                  'status', 'cover_letter', 'why_interested', 'skills_and_experience', 
                  'availability_start_date', 'submitted_at', 'reviewed_at', 'reviewed_by', 
                  'reviewed_by_name', 'admin_notes', 'status_history']
         read_only_fields = ['id', 'applicant', 'submitted_at', 'reviewed_at', 'reviewed_by']
 
 
+class ApplicationSummarySerializer(ApplicationSerializer):
+    """List rows: everything but the status history, which only the detail view shows."""
+    class Meta(ApplicationSerializer.Meta):
+        fields = [name for name in ApplicationSerializer.Meta.fields if name != 'status_history']
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
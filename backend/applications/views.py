@@ -4,9 +4,14 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch
 
 from .models import Program, Application, ApplicationStatusHistory
-from .serializers import ProgramSerializer, ApplicationSerializer, ApplicationCreateSerializer, ApplicationUpdateSerializer
+from .serializers import (
+    ProgramSerializer, ApplicationSerializer, ApplicationSummarySerializer,
+    ApplicationCreateSerializer, ApplicationUpdateSerializer,
+)
 
 User = get_user_model()
 
@@ -64,15 +69,27 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     ordering_fields = ['submitted_at', 'reviewed_at']
     ordering = ['-submitted_at']
     
+    # Actions that render the full ApplicationSerializer, status history included
+    DETAIL_ACTIONS = ('retrieve', 'approve', 'reject')
+
     def get_queryset(self):
+        queryset = self.get_scoped_queryset()
+        if self.action in ('update', 'partial_update', 'destroy'):
+            return queryset
+        queryset = queryset.select_related('applicant', 'program', 'reviewed_by')
+        if self.action in self.DETAIL_ACTIONS:
+            queryset = queryset.prefetch_related(Prefetch(
+                'status_history', queryset=ApplicationStatusHistory.objects.select_related('changed_by')
+            ))
+        return queryset
+
+    def get_scoped_queryset(self):
         user = self.request.user
         if user.role == 'admin':
             return Application.objects.all()
         if user.role == 'supervisor':
-            from accounts.models import SupervisorAssignment
-            intern_ids = SupervisorAssignment.objects.filter(
-                supervisor=user
-            ).values_list('intern_id', flat=True)
+            from accounts.utils import get_supervised_intern_ids
+            intern_ids = get_supervised_intern_ids(user)
             return Application.objects.filter(applicant_id__in=intern_ids)
         return Application.objects.filter(applicant=user)
     
@@ -81,6 +98,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             return ApplicationCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return ApplicationUpdateSerializer
+        elif self.action in ['list', 'my_applications']:
+            return ApplicationSummarySerializer
         return ApplicationSerializer
     
     def create(self, request, *args, **kwargs):
@@ -105,11 +124,14 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def my_applications(self, request):
-        applications = Application.objects.filter(applicant=request.user)
+        applications = Application.objects.filter(applicant=request.user).select_related(
+            'applicant', 'program', 'reviewed_by'
+        )
         serializer = self.get_serializer(applications, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @transaction.atomic
     def approve(self, request, pk=None):
         if request.user.role != 'admin':
             return Response({'error': 'Only admins can approve applications'},
@@ -121,8 +143,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application.save()
 
         # Send in-app notification
-        from notifications.utils import send_notification
-        from notifications.tasks import send_application_status_email
+        from notifications.utils import send_notification, defer_task
         send_notification(
             recipient=application.applicant,
             title='Application Approved',
@@ -131,16 +152,14 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             related_object_id=application.id,
             related_object_type='application',
         )
-        # Send email via Celery
-        send_application_status_email.delay(
-            application_id=application.id,
-            status='approved',
-        )
+        # Email goes through the outbox, committed with the status change
+        defer_task('notifications.tasks.send_application_status_email', application.id, 'approved')
 
         serializer = self.get_serializer(application)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @transaction.atomic
     def reject(self, request, pk=None):
         if request.user.role != 'admin':
             return Response({'error': 'Only admins can reject applications'},
@@ -152,8 +171,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application.save()
 
         # Send in-app notification
-        from notifications.utils import send_notification
-        from notifications.tasks import send_application_status_email
+        from notifications.utils import send_notification, defer_task
         send_notification(
             recipient=application.applicant,
             title='Application Rejected',
@@ -162,11 +180,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             related_object_id=application.id,
             related_object_type='application',
         )
-        # Send email via Celery
-        send_application_status_email.delay(
-            application_id=application.id,
-            status='rejected',
-        )
+        # Email goes through the outbox, committed with the status change
+        defer_task('notifications.tasks.send_application_status_email', application.id, 'rejected')
 
         serializer = self.get_serializer(application)
         return Response(serializer.data)
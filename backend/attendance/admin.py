@@ -12,7 +12,7 @@ class AttendanceRecordAdmin(admin.ModelAdmin):
 
 @admin.register(QRToken)
 class QRTokenAdmin(admin.ModelAdmin):
-    list_display = ('token', 'valid_date', 'expires_at', 'is_active', 'scan_count', 'created_by')
-    list_filter = ('is_active', 'valid_date')
+    list_display = ('token', 'valid_date', 'expires_at', 'is_active', 'rotating', 'scan_count', 'created_by')
+    list_filter = ('is_active', 'rotating', 'valid_date')
     search_fields = ('token',)
     date_hierarchy = 'valid_date'
\ No newline at end of file
@@ -0,0 +1,130 @@
+import queue
+import statistics
+import threading
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from accounts.models import User
+from attendance.models import AttendanceRecord, QRToken
+from reports.benchmark import benchmark_database
+
+
+class Command(BaseCommand):
+    help = ('Concurrency benchmark for the QR scan path: fire scans from many threads at a '
+            'target rate against a throwaway database and verify no scan counts are lost')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interns', type=int, default=500, help='Number of scanning interns')
+        parser.add_argument('--scans-per-intern', type=int, default=2, choices=[1, 2],
+                            help='1 = check-in only, 2 = check-in then check-out')
+        parser.add_argument('--rate', type=int, default=500, help='Target scans per second')
+        parser.add_argument('--workers', type=int, default=64, help='Concurrent client threads')
+        parser.add_argument('--max-p95-ms', type=float, default=1000.0,
+                            help='Fail if the 95th percentile latency exceeds this')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            result = self.run(options)
+
+        self.stdout.write(
+            f"scans={result['scans']} ok={result['ok']} failed={result['failed']} "
+            f"throughput={result['throughput']:.0f}/s p50={result['p50']:.1f}ms "
+            f"p95={result['p95']:.1f}ms p99={result['p99']:.1f}ms"
+        )
+        self.stdout.write(
+            f"scan_count={result['scan_count']} attendance_rows={result['rows']} "
+            f"checked_out={result['checked_out']}"
+        )
+
+        problems = []
+        if result['scan_count'] != result['scans']:
+            problems.append(f"lost scan counts: {result['scans'] - result['scan_count']}")
+        if result['failed']:
+            problems.append(f"{result['failed']} scans failed")
+        if result['rows'] != options['interns']:
+            problems.append(f"expected {options['interns']} attendance rows, found {result['rows']}")
+        if result['throughput'] < options['rate'] * 0.95:
+            problems.append(f"throughput {result['throughput']:.0f}/s below target {options['rate']}/s")
+        if result['p95'] > options['max_p95_ms']:
+            problems.append(f"p95 latency {result['p95']:.1f}ms above {options['max_p95_ms']}ms")
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS('QR scan path held the target rate with no lost counts'))
+
+    def run(self, options):
+        call_command('generate_load_data', scale=options['interns'], days=0, stdout=StringIO())
+        admin = User.objects.filter(role='admin').first()
+        interns = list(User.objects.filter(role='intern'))
+        AttendanceRecord.objects.filter(date=timezone.now().date()).delete()
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        token = client.post(reverse('attendance-generate-qr')).data['token']
+
+        auth = {
+            intern.id: f'Token {Token.objects.get_or_create(user=intern)[0].key}'
+            for intern in interns
+        }
+        # One scan per intern per round; rounds run back to back
+        jobs = queue.Queue()
+        scans = [intern.id for _ in range(options['scans_per_intern']) for intern in interns]
+        for index, intern_id in enumerate(scans):
+            jobs.put((index, intern_id))
+
+        latencies, failures = [], []
+        lock = threading.Lock()
+        url = reverse('attendance-qr-scan')
+        interval = 1.0 / options['rate']
+        started = time.perf_counter()
+
+        def worker():
+            # Server errors come back as 500 responses instead of killing the thread
+            scan_client = APIClient(raise_request_exception=False)
+            try:
+                while True:
+                    try:
+                        index, intern_id = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+                    # Pace requests to the target rate
+                    delay = started + index * interval - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    sent = time.perf_counter()
+                    response = scan_client.post(url, {'token': token}, format='json',
+                                                HTTP_AUTHORIZATION=auth[intern_id])
+                    elapsed = (time.perf_counter() - sent) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                        if response.status_code != 200:
+                            failures.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - started
+
+        latencies.sort()
+        today = timezone.now().date()
+        return {
+            'scans': len(scans),
+            'ok': len(latencies) - len(failures),
+            'failed': len(failures) + len(scans) - len(latencies),
+            'throughput': len(scans) / duration,
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'p99': latencies[int(len(latencies) * 0.99) - 1],
+            'scan_count': QRToken.objects.get(token=token).scan_count,
+            'rows': AttendanceRecord.objects.filter(date=today).count(),
+            'checked_out': AttendanceRecord.objects.filter(date=today, check_out__isnull=False).count(),
+        }
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_qrtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qrtoken',
+            name='rotating',
+            field=models.BooleanField(default=False, help_text='Kiosk shows a signed code that changes every few seconds'),
+        ),
+    ]
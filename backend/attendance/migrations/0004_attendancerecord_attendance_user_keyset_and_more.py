@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_qrtoken_rotating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='attendance_user_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['-created_at', '-id'], name='attendance_keyset'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_attendancerecord_attendance_user_keyset_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status'),
+        ),
+    ]
@@ -23,6 +23,13 @@ class AttendanceRecord(models.Model):
     class Meta:
         unique_together = ['user', 'date']
         ordering = ['-date']
+        # Keyset pagination (intern_management.pagination): per user and across all users
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='attendance_user_keyset'),
+            models.Index(fields=['-created_at', '-id'], name='attendance_keyset'),
+            # Per-day status counts (dashboards, admin reports); (user, date) is the unique key
+            models.Index(fields=['date', 'status'], name='attendance_date_status'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.date} - {self.status}"
@@ -36,6 +43,7 @@ class QRToken(models.Model):
     expires_at = models.DateTimeField(help_text='When this token expires')
     is_active = models.BooleanField(default=True, help_text='Admin can deactivate to revoke token')
     scan_count = models.PositiveIntegerField(default=0, help_text='Total number of times this QR has been scanned')
+    rotating = models.BooleanField(default=False, help_text='Kiosk shows a signed code that changes every few seconds')
 
     class Meta:
         ordering = ['-created_at']
@@ -1,7 +1,37 @@
 import uuid
 from rest_framework import serializers
+from django.db import models
 from django.utils import timezone
 from .models import AttendanceRecord, QRToken
+from .utils import is_rotating_code, rotating_code
+
+
+def checked_in_state(check_in, check_out):
+    if check_in and not check_out:
+        return 'checked_in'
+    if check_in and check_out:
+        return 'checked_out'
+    return None
+
+
+class AttendanceRecordListSerializer(serializers.ListSerializer):
+    """Resolves checked_in_today for every user on the page with one query."""
+
+    def to_representation(self, data):
+        records = list(data.all() if isinstance(data, models.Manager) else data)
+        today = timezone.now().date()
+
+        # Today's rows on the page already carry their own state
+        states = {r.user_id: checked_in_state(r.check_in, r.check_out) for r in records if r.date == today}
+        missing = {r.user_id for r in records} - states.keys()
+        if missing:
+            for user_id, check_in, check_out in AttendanceRecord.objects.filter(
+                user_id__in=missing, date=today
+            ).values_list('user_id', 'check_in', 'check_out'):
+                states[user_id] = checked_in_state(check_in, check_out)
+
+        self.child.checked_in_today_by_user = states
+        return super().to_representation(records)
 
 
 class AttendanceRecordSerializer(serializers.ModelSerializer):
@@ -13,17 +43,19 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'user_name', 'date', 'check_in', 'check_out',
                  'status', 'notes', 'checked_in_today', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = AttendanceRecordListSerializer
 
     def get_checked_in_today(self, obj):
+        states = getattr(self, 'checked_in_today_by_user', None)
+        if states is not None:
+            return states.get(obj.user_id)
         today = timezone.now().date()
-        record = AttendanceRecord.objects.filter(user=obj.user, date=today).first()
-        if not record:
-            return None
-        if record.check_in and not record.check_out:
-            return 'checked_in'
-        if record.check_in and record.check_out:
-            return 'checked_out'
-        return None
+        if obj.date == today:
+            return checked_in_state(obj.check_in, obj.check_out)
+        record = AttendanceRecord.objects.filter(
+            user_id=obj.user_id, date=today
+        ).values_list('check_in', 'check_out').first()
+        return checked_in_state(*record) if record else None
 
 
 class AttendanceRecordCreateSerializer(serializers.ModelSerializer):
@@ -48,13 +80,38 @@ class AttendanceSummarySerializer(serializers.Serializer):
 
 class QRTokenSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
+    code = serializers.SerializerMethodField()
+    code_expires_in = serializers.SerializerMethodField()
 
     class Meta:
         model = QRToken
         fields = ['id', 'token', 'created_by', 'created_by_name', 'valid_date',
-                 'expires_at', 'is_active', 'scan_count', 'created_at']
-        read_only_fields = ['id', 'token', 'created_by', 'created_at', 'scan_count']
+                 'expires_at', 'is_active', 'rotating', 'code', 'code_expires_in',
+                 'scan_count', 'created_at']
+        read_only_fields = ['id', 'token', 'created_by', 'created_at', 'scan_count', 'rotating']
+
+    def to_representation(self, instance):
+        # Computed once per token so code and code_expires_in agree
+        self._rotating = (rotating_code(instance.id, instance.valid_date)
+                          if instance.rotating and instance.is_active else (None, None))
+        return super().to_representation(instance)
+
+    def get_code(self, obj):
+        """The value to encode in the QR: the current signed code for rotating tokens."""
+        return self._rotating[0] or str(obj.token)
+
+    def get_code_expires_in(self, obj):
+        return self._rotating[1]
 
 
 class QRScanSerializer(serializers.Serializer):
-    token = serializers.UUIDField(help_text='The QR token UUID scanned from the QR code')
\ No newline at end of file
+    token = serializers.CharField(help_text='The QR token UUID or rotating code scanned from the QR code')
+
+    def validate_token(self, value):
+        value = value.strip()
+        if is_rotating_code(value):
+            return value
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            raise serializers.ValidationError('Must be a valid UUID or rotating QR code.')
\ No newline at end of file
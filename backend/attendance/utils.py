@@ -0,0 +1,236 @@
+import hashlib
+import hmac
+import re
+import time
+from datetime import time as dtime
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from .models import AttendanceRecord, QRToken
+
+QR_TOKEN_CACHE_PREFIX = 'attendance:qr:'
+# Event counters only matter for the day they describe
+QR_EVENTS_TIMEOUT = 60 * 60 * 48
+ROTATING_CODE_RE = re.compile(r'^(\d+)\.(\d+)\.([0-9a-f]{16})$')
+CUTOFF_TIME = dtime(12, 0)     # AM/PM boundary at noon
+
+
+def _qr_cache_key(token):
+    return f'{QR_TOKEN_CACHE_PREFIX}{token}'
+
+
+def get_qr_token_state(token):
+    """Return {'id', 'valid_date', 'expires_at', 'is_active', 'rotating'} for a token, or None if unknown.
+
+    Lookups are served from the cache; unknown tokens are cached too so
+    repeated bad scans don't reach the database.
+    """
+    key = _qr_cache_key(token)
+    state = cache.get(key)
+    if state is None:
+        state = QRToken.objects.filter(token=token).values(
+            'id', 'valid_date', 'expires_at', 'is_active', 'rotating'
+        ).first() or {}
+        cache.set(key, state, settings.QR_TOKEN_CACHE_TIMEOUT)
+    return state or None
+
+
+def _rotating_cache_key(valid_date):
+    return f'{QR_TOKEN_CACHE_PREFIX}rotating:{valid_date.isoformat()}'
+
+
+def _version_cache_key(valid_date):
+    return f'{QR_TOKEN_CACHE_PREFIX}version:{valid_date.isoformat()}'
+
+
+def _scan_count_cache_key(token_id):
+    return f'{QR_TOKEN_CACHE_PREFIX}scans:{token_id}'
+
+
+def get_qr_version(valid_date):
+    """Counter bumped whenever the active token for a date changes; streams watch it."""
+    return cache.get(_version_cache_key(valid_date), 0)
+
+
+def bump_qr_version(valid_date):
+    key = _version_cache_key(valid_date)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, QR_EVENTS_TIMEOUT)
+
+
+def get_scan_count(token_id):
+    """Scan count mirrored in the cache, loaded from the row on a miss."""
+    key = _scan_count_cache_key(token_id)
+    count = cache.get(key)
+    if count is None:
+        count = QRToken.objects.filter(pk=token_id).values_list('scan_count', flat=True).first() or 0
+        cache.add(key, count, QR_EVENTS_TIMEOUT)
+    return count
+
+
+def cache_qr_token(qr_token):
+    cache.set(_qr_cache_key(qr_token.token), {
+        'id': qr_token.id,
+        'valid_date': qr_token.valid_date,
+        'expires_at': qr_token.expires_at,
+        'is_active': qr_token.is_active,
+        'rotating': qr_token.rotating,
+    }, settings.QR_TOKEN_CACHE_TIMEOUT)
+    if qr_token.rotating and qr_token.is_active:
+        cache.set(_rotating_cache_key(qr_token.valid_date), qr_token.id, settings.QR_TOKEN_CACHE_TIMEOUT)
+    bump_qr_version(qr_token.valid_date)
+
+
+def deactivate_qr_tokens(valid_date):
+    """Deactivate every active token for a date and drop their cached state."""
+    tokens = list(QRToken.objects.filter(
+        valid_date=valid_date, is_active=True
+    ).values_list('token', flat=True))
+    if not tokens:
+        return 0
+    updated = QRToken.objects.filter(token__in=tokens).update(is_active=False)
+    cache.delete_many([_qr_cache_key(token) for token in tokens] + [_rotating_cache_key(valid_date)])
+    bump_qr_version(valid_date)
+    return updated
+
+
+# ── Rotating codes ───────────────────────────────────────────────
+# A rotating code is "<token id>.<time step>.<signature>". The signature is an
+# HMAC of the id and step under a secret derived from SECRET_KEY and the date,
+# so a scan is verified by computation alone; the QRToken row only records
+# who opened the session and whether it has been revoked.
+
+def _day_secret(valid_date):
+    return salted_hmac('attendance.qr.rotating', valid_date.isoformat()).digest()
+
+
+def _sign_step(token_id, step, valid_date):
+    message = f'{token_id}:{step}'.encode()
+    return hmac.new(_day_secret(valid_date), message, hashlib.sha256).hexdigest()[:16]
+
+
+def current_step(at=None):
+    return int((at if at is not None else time.time()) // settings.QR_ROTATION_INTERVAL)
+
+
+def rotating_code(token_id, valid_date, at=None):
+    """Return (code, seconds until it rotates) for a rotating token."""
+    at = at if at is not None else time.time()
+    step = current_step(at)
+    expires_in = (step + 1) * settings.QR_ROTATION_INTERVAL - at
+    return f'{token_id}.{step}.{_sign_step(token_id, step, valid_date)}', int(expires_in) + 1
+
+
+def is_rotating_code(value):
+    return bool(ROTATING_CODE_RE.match(value))
+
+
+def get_active_rotating_id(valid_date):
+    """Id of the active rotating token for a date, or None (cached revocation check)."""
+    key = _rotating_cache_key(valid_date)
+    token_id = cache.get(key)
+    if token_id is None:
+        token_id = QRToken.objects.filter(
+            valid_date=valid_date, is_active=True, rotating=True
+        ).values_list('id', flat=True).first() or 0
+        cache.set(key, token_id, settings.QR_TOKEN_CACHE_TIMEOUT)
+    return token_id or None
+
+
+def verify_rotating_code(code, valid_date, at=None):
+    """Return the token id a rotating code was issued for, or None if it is invalid.
+
+    Codes from the current step and the previous QR_ROTATION_GRACE_STEPS steps
+    are accepted, so a phone that read the code just before it rotated still
+    gets through.
+    """
+    match = ROTATING_CODE_RE.match(code)
+    if not match:
+        return None
+    token_id, step, signature = int(match[1]), int(match[2]), match[3]
+    now_step = current_step(at)
+    if not now_step - settings.QR_ROTATION_GRACE_STEPS <= step <= now_step:
+        return None
+    if not constant_time_compare(signature, _sign_step(token_id, step, valid_date)):
+        return None
+    return token_id
+
+
+def increment_scan_count(token_id):
+    """Atomically bump a token's scan counter (no read-modify-write)."""
+    QRToken.objects.filter(pk=token_id).update(scan_count=F('scan_count') + 1)
+    try:
+        cache.incr(_scan_count_cache_key(token_id))
+    except ValueError:
+        # Not mirrored yet; get_scan_count loads it from the row
+        pass
+
+
+def record_scan(user_id, date, check_in_time, check_out_time, now):
+    """Apply a QR scan to the user's attendance row in a single upsert.
+
+    No row yet -> insert checked in. Row without check-in -> check in.
+    Row checked in but not out -> check out. Row already complete -> untouched.
+
+    Returns (check_in, check_out, status) of the written row, or None when
+    attendance for the day was already complete.
+    """
+    qn = connection.ops.quote_name
+    table = qn(AttendanceRecord._meta.db_table)
+    check_in, check_out, status = qn('check_in'), qn('check_out'), qn('status')
+    sql = f"""
+        INSERT INTO {table}
+            ({qn('user_id')}, {qn('date')}, {check_in}, {check_out}, {status},
+             {qn('notes')}, {qn('created_at')}, {qn('updated_at')})
+        VALUES (%s, %s, %s, NULL, 'present', '', %s, %s)
+        ON CONFLICT ({qn('user_id')}, {qn('date')}) DO UPDATE SET
+            {check_out} = CASE WHEN {table}.{check_in} IS NULL
+                THEN {table}.{check_out} ELSE %s END,
+            {status} = CASE WHEN {table}.{check_in} IS NULL
+                THEN 'present' ELSE {table}.{status} END,
+            {check_in} = COALESCE({table}.{check_in}, EXCLUDED.{check_in}),
+            {qn('updated_at')} = EXCLUDED.{qn('updated_at')}
+        WHERE {table}.{check_out} IS NULL
+        RETURNING {check_in}, {check_out}, {status}
+    """
+    ops = connection.ops
+    timestamp = ops.adapt_datetimefield_value(now)
+    params = [
+        user_id, ops.adapt_datefield_value(date), ops.adapt_timefield_value(check_in_time),
+        timestamp, timestamp, ops.adapt_timefield_value(check_out_time),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def today_status(user, today=None):
+    """The user's attendance for today as returned by the today_status action (one query)."""
+    today = today or timezone.now().date()
+    record = AttendanceRecord.objects.filter(user=user, date=today).only(
+        'check_in', 'check_out', 'status'
+    ).first()
+    if record is None:
+        return {
+            'date': str(today),
+            'check_in': None,
+            'check_out': None,
+            'status': None,
+            'checked_in': False,
+            'checked_out': False,
+            'period': None,
+        }
+    return {
+        'date': str(today),
+        'check_in': str(record.check_in) if record.check_in else None,
+        'check_out': str(record.check_out) if record.check_out else None,
+        'status': record.status,
+        'checked_in': bool(record.check_in),
+        'checked_out': bool(record.check_out),
+        'period': 'AM' if (record.check_in and record.check_in < CUTOFF_TIME) else 'PM',
+    }
@@ -1,12 +1,22 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, time
-from django.db.models import Count
+from django.db.models import Count, Q
+from intern_management.pagination import SelectablePagination
 from intern_management.permissions import IsAdminOrSupervisor
-from accounts.models import SupervisorAssignment
+from intern_management.streaming import EventStreamRenderer, event_stream, sse_response, streams_unavailable
+from accounts.utils import get_supervised_intern_ids
+from reports.utils import invalidate_dashboards
 from .models import AttendanceRecord, QRToken
+from .utils import (
+    get_qr_token_state, cache_qr_token, deactivate_qr_tokens,
+    increment_scan_count, record_scan, verify_rotating_code, get_active_rotating_id,
+    get_qr_version, get_scan_count, current_step, today_status, CUTOFF_TIME,
+)
 from .serializers import (
     AttendanceRecordSerializer, AttendanceRecordCreateSerializer,
     AttendanceSummarySerializer, QRTokenSerializer, QRScanSerializer
@@ -15,17 +25,17 @@ from .serializers import (
 
 class AttendanceRecordViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
 
     def get_queryset(self):
         user = self.request.user
+        queryset = AttendanceRecord.objects.select_related('user')
         if user.role == 'admin':
-            return AttendanceRecord.objects.all()
+            return queryset
         if user.role == 'supervisor':
-            intern_ids = SupervisorAssignment.objects.filter(
-                supervisor=user
-            ).values_list('intern_id', flat=True)
-            return AttendanceRecord.objects.filter(user_id__in=intern_ids) | AttendanceRecord.objects.filter(user=user)
-        return AttendanceRecord.objects.filter(user=user)
+            intern_ids = get_supervised_intern_ids(user)
+            return queryset.filter(Q(user_id__in=intern_ids) | Q(user=user))
+        return queryset.filter(user=user)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -35,7 +45,6 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     # ── Fixed attendance times ──
     CHECK_IN_TIME = time(8, 30)    # 8:30 AM
     CHECK_OUT_TIME = time(17, 0)   # 5:00 PM
-    CUTOFF_TIME = time(12, 0)     # AM/PM boundary at noon
 
     @action(detail=False, methods=['post'])
     def check_in(self, request):
@@ -73,13 +82,11 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
         else:
             date = timezone.now().date()
 
-        records = AttendanceRecord.objects.filter(date=date)
+        records = AttendanceRecord.objects.filter(date=date).select_related('user')
         if request.user.role not in ('admin', 'supervisor'):
             records = records.filter(user=request.user)
         elif request.user.role == 'supervisor':
-            intern_ids = SupervisorAssignment.objects.filter(
-                supervisor=request.user
-            ).values_list('intern_id', flat=True)
+            intern_ids = get_supervised_intern_ids(request.user)
             records = records.filter(user_id__in=intern_ids)
 
         serializer = AttendanceRecordSerializer(records, many=True)
@@ -112,37 +119,19 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def today_status(self, request):
         """Get the current user's attendance status for today."""
-        today = timezone.now().date()
-        try:
-            record = AttendanceRecord.objects.get(user=request.user, date=today)
-            return Response({
-                'date': str(today),
-                'check_in': str(record.check_in) if record.check_in else None,
-                'check_out': str(record.check_out) if record.check_out else None,
-                'status': record.status,
-                'checked_in': bool(record.check_in),
-                'checked_out': bool(record.check_out),
-                'period': 'AM' if (record.check_in and record.check_in < self.CUTOFF_TIME) else 'PM',
-            })
-        except AttendanceRecord.DoesNotExist:
-            return Response({
-                'date': str(today),
-                'check_in': None,
-                'check_out': None,
-                'status': None,
-                'checked_in': False,
-                'checked_out': False,
-                'period': None,
-            })
+        return Response(today_status(request.user))
 
     # ── QR Code Actions ──────────────────────────────────────────
 
     @action(detail=False, methods=['post'], permission_classes=[IsAdminOrSupervisor])
     def generate_qr(self, request):
         """Generate a new QR token for today.
-        Optional 'period' param: 'AM' (default, valid all day) or 'PM' (afternoon check-out window)."""
+        Optional 'period' param: 'AM' (default, valid all day) or 'PM' (afternoon check-out window).
+        Optional 'rotating' param: the kiosk then shows a signed code that changes every
+        QR_ROTATION_INTERVAL seconds instead of the fixed token."""
         today = timezone.now().date()
         period = request.data.get('period', 'AM').upper()
+        rotating = str(request.data.get('rotating', '')).lower() in ('1', 'true', 'yes')
 
         # Both AM and PM tokens are valid all day, but PM is for afternoon check-out
         expires_at = timezone.make_aware(
@@ -150,14 +139,16 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
         )
 
         # Deactivate any previous active tokens for today
-        QRToken.objects.filter(valid_date=today, is_active=True).update(is_active=False)
+        deactivate_qr_tokens(today)
 
         # Create new token
         qr_token = QRToken.objects.create(
             created_by=request.user,
             valid_date=today,
             expires_at=expires_at,
+            rotating=rotating,
         )
+        cache_qr_token(qr_token)
 
         serializer = QRTokenSerializer(qr_token)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -166,74 +157,75 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     def qr_scan(self, request):
         """Scan a QR token to check in or check out.
         1st scan = check-in at 8:30 AM, 2nd scan = check-out at 5:00 PM.
-        The time of day only affects the period label (AM/PM), not the recorded times."""
+        The time of day only affects the period label (AM/PM), not the recorded times.
+
+        Hot path for the morning rush: the token is validated from the cache (or, for
+        rotating codes, by recomputing its signature), the scan counter is bumped
+        atomically and the attendance row is upserted in a single statement, so a
+        scan costs two writes and no reads."""
         serializer = QRScanSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        token_value = serializer.validated_data['token']
-        today = timezone.now().date()
         now = timezone.now()
-        current_time = now.time()
+        today = now.date()
+
+        token = serializer.validated_data['token']
+        if isinstance(token, str):
+            # Rotating code: signature and time step are checked by computation,
+            # the cached active id covers revocation
+            token_id = verify_rotating_code(token, today)
+            if token_id is None:
+                return Response({'error': 'This QR code has expired'}, status=status.HTTP_400_BAD_REQUEST)
+            if get_active_rotating_id(today) != token_id:
+                return Response({'error': 'This QR code has been deactivated'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            token_id = self._validate_static_token(token, now)
+            if isinstance(token_id, Response):
+                return token_id
 
-        # Validate the QR token
-        try:
-            qr_token = QRToken.objects.get(token=token_value)
-        except QRToken.DoesNotExist:
+        increment_scan_count(token_id)
+
+        # 1st scan = check in at 8:30 AM, 2nd scan = check out at 5:00 PM
+        row = record_scan(request.user.id, today, self.CHECK_IN_TIME, self.CHECK_OUT_TIME, now)
+        if row is None:
+            return Response(
+                {'error': 'You have already completed attendance for today (checked in and out)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # record_scan is a raw upsert, so no model signal clears the dashboards
+        invalidate_dashboards([request.user.id])
+        check_in, check_out, record_status = row
+        return Response({
+            'date': str(today),
+            'check_in': str(check_in) if check_in else None,
+            'check_out': str(check_out) if check_out else None,
+            'status': record_status,
+            'period': 'AM' if now.time() < CUTOFF_TIME else 'PM',
+            'action': 'checked_out' if check_out else 'checked_in',
+        })
+
+    def _validate_static_token(self, token, now):
+        """Return the token id for a fixed QR token, or an error Response."""
+        qr_token = get_qr_token_state(token)
+        if qr_token is None:
             return Response({'error': 'Invalid QR code'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not qr_token.is_active:
+        if not qr_token['is_active']:
             return Response({'error': 'This QR code has been deactivated'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if qr_token.valid_date != today:
+        if qr_token['rotating']:
+            return Response({'error': 'Scan the code currently shown on the kiosk'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if qr_token['valid_date'] != now.date():
             return Response({'error': 'This QR code is not valid for today'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if now > qr_token.expires_at:
+        if now > qr_token['expires_at']:
             return Response({'error': 'This QR code has expired'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Increment scan count
-        qr_token.scan_count += 1
-        qr_token.save(update_fields=['scan_count'])
-
-        # Determine period label based on current time
-        period = 'AM' if current_time < self.CUTOFF_TIME else 'PM'
-
-        # 1st scan = check in at 8:30 AM, 2nd scan = check out at 5:00 PM
-        try:
-            record = AttendanceRecord.objects.get(user=request.user, date=today)
-        except AttendanceRecord.DoesNotExist:
-            # No record yet → first scan → check in at 8:30 AM
-            record = AttendanceRecord.objects.create(
-                user=request.user,
-                date=today,
-                check_in=self.CHECK_IN_TIME,
-                status='present'
-            )
-            action = 'checked_in'
-        else:
-            if not record.check_in:
-                # Haven't checked in yet → check in at 8:30 AM
-                record.check_in = self.CHECK_IN_TIME
-                record.status = 'present'
-                record.save()
-                action = 'checked_in'
-            elif not record.check_out:
-                # Already checked in, not checked out → check out at 5:00 PM
-                record.check_out = self.CHECK_OUT_TIME
-                record.save()
-                action = 'checked_out'
-            else:
-                # Already completed both
-                return Response(
-                    {'error': 'You have already completed attendance for today (checked in and out)'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        result_serializer = AttendanceRecordSerializer(record)
-        response_data = result_serializer.data
-        response_data['period'] = period
-        response_data['action'] = action
-        return Response(response_data)
+        return qr_token['id']
 
     @action(detail=False, methods=['get'], permission_classes=[IsAdminOrSupervisor])
     def active_qr(self, request):
@@ -246,11 +238,52 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
         except QRToken.DoesNotExist:
             return Response({'active': False, 'message': 'No active QR code for today'})
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminOrSupervisor],
+            renderer_classes=[JSONRenderer, EventStreamRenderer])
+    def qr_stream(self, request):
+        """Server-sent events for kiosks, replacing active_qr polling.
+
+        'qr' carries the active token (or {'active': False}) whenever generate_qr or
+        deactivate_qr changes it, and the next code each time a rotating token rotates.
+        'scan' carries scan_count ticks. Idle ticks are cache reads only.
+        Answers 503 unless STREAMING_ENABLED; kiosks then poll active_qr."""
+        if not settings.STREAMING_ENABLED:
+            return streams_unavailable()
+        today = timezone.now().date()
+        state = {'version': None, 'token': None, 'step': None}
+
+        def poll():
+            version = get_qr_version(today)
+            qr_token = state['token']
+            if version != state['version']:
+                state['version'] = version
+                qr_token = state['token'] = QRToken.objects.select_related('created_by').filter(
+                    valid_date=today, is_active=True
+                ).first()
+                if qr_token is None:
+                    return [('qr', {'active': False, 'message': 'No active QR code for today'})]
+                state['step'] = current_step()
+                return [('qr', QRTokenSerializer(qr_token).data)]
+            if qr_token is None:
+                return []
+
+            events = []
+            scan_count = get_scan_count(qr_token.id)
+            if scan_count != qr_token.scan_count:
+                qr_token.scan_count = scan_count
+                events.append(('scan', {'scan_count': scan_count}))
+            if qr_token.rotating and current_step() != state['step']:
+                state['step'] = current_step()
+                events.append(('qr', QRTokenSerializer(qr_token).data))
+            return events
+
+        return sse_response(event_stream(poll))
+
     @action(detail=False, methods=['post'], permission_classes=[IsAdminOrSupervisor])
     def deactivate_qr(self, request):
         """Deactivate the current active QR token."""
         today = timezone.now().date()
-        updated = QRToken.objects.filter(valid_date=today, is_active=True).update(is_active=False)
+        updated = deactivate_qr_tokens(today)
         if updated:
             return Response({'message': 'QR code deactivated successfully'})
         return Response({'message': 'No active QR code to deactivate'})
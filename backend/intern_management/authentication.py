@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_CACHE_PREFIX = 'auth:token:'
+
+
+def _token_cache_key(key):
+    return f'{TOKEN_CACHE_PREFIX}{key}'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that keeps token -> user snapshots in the cache.
+
+    Saves the Token/User join on every request. Snapshots live for
+    TOKEN_AUTH_CACHE_TIMEOUT seconds; views that log out, deactivate, change
+    the role of or reset the password of a user call invalidate_user_tokens.
+
+    request.user is therefore a snapshot up to that old. Views that write the
+    user save a freshly loaded row or pass update_fields, never the snapshot.
+
+    Without a shared cache (CACHE_SHARED) the invalidations would only reach
+    the current worker, so every request loads the token like TokenAuthentication.
+    """
+
+    def authenticate_credentials(self, key):
+        if not settings.CACHE_SHARED:
+            return super().authenticate_credentials(key)
+        cache_key = _token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cache.set(cache_key, token, settings.TOKEN_AUTH_CACHE_TIMEOUT)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+
+def invalidate_token(key):
+    cache.delete(_token_cache_key(key))
+
+
+def invalidate_user_tokens(user):
+    """Drop cached snapshots for a user's tokens so the next request reloads them."""
+    from rest_framework.authtoken.models import Token
+
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    cache.delete_many([_token_cache_key(key) for key in keys])
@@ -0,0 +1,52 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination over a fixed (-created_at, -id) keyset.
+
+    Each page is an index range scan from the cursor position, with no
+    COUNT(*) and no OFFSET, so deep pages cost the same as the first one.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # Always the keyset the composite indexes cover; ?ordering= does not apply here
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class SelectablePagination(PageNumberPagination):
+    """Page-number pagination unless the request opts into cursors.
+
+    ?pagination=cursor (or a ?cursor= token from a previous page) switches to
+    KeysetCursorPagination. Views opt in by using this class; the response then
+    has next/previous links and results, but no count.
+    """
+    cursor_class = KeysetCursorPagination
+
+    def __init__(self):
+        self._cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params:
+            self._cursor = self.cursor_class()
+            page = self._cursor.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self._cursor.display_page_controls
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self._cursor is not None:
+            return self._cursor.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self._cursor is not None:
+            return self._cursor.to_html()
+        return super().to_html()
+
+    def get_paginated_response_schema(self, schema):
+        if self._cursor is not None:
+            return self._cursor.get_paginated_response_schema(schema)
+        return super().get_paginated_response_schema(schema)
@@ -0,0 +1,18 @@
+class SparseFieldsetMixin:
+    """ModelSerializer mixin that takes an optional `fields` kwarg (iterable of names).
+
+    Only the named fields are rendered; unknown names are ignored. Views pass
+    the client's ?fields= list through get_serializer.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def query_param_list(request, name):
+    """Split a comma-separated query parameter into a set of non-empty names."""
+    return {value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()}
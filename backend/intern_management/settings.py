@@ -117,7 +117,7 @@ AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'intern_management.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -193,12 +193,123 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Interns Management System <noreply@taskstracker.com>')
 
+# Outgoing email is queued and sent in batches over one SMTP connection
+EMAIL_BATCH_SIZE = config('EMAIL_BATCH_SIZE', default=100, cast=int)
+EMAIL_FLUSH_INTERVAL = config('EMAIL_FLUSH_INTERVAL', default=10.0, cast=float)
+EMAIL_MAX_ATTEMPTS = config('EMAIL_MAX_ATTEMPTS', default=5, cast=int)
+# A claimed batch is released after this long if its sender never finishes
+EMAIL_CLAIM_TIMEOUT = config('EMAIL_CLAIM_TIMEOUT', default=300, cast=int)
+# Sent rows are kept this long for inspection in the admin, then purged daily
+EMAIL_SENT_RETENTION_DAYS = config('EMAIL_SENT_RETENTION_DAYS', default=7, cast=int)
+
+# Background tasks: 'celery', 'thread' (in-process pool backed by a DB retry
+# queue) or 'auto' = celery when a broker (REDIS_URL) is configured
+TASK_BACKEND = config('TASK_BACKEND', default='auto')
+TASK_BROKER_CONFIGURED = bool(config('REDIS_URL', default=''))
+TASK_THREAD_WORKERS = config('TASK_THREAD_WORKERS', default=4, cast=int)
+TASK_MAX_ATTEMPTS = config('TASK_MAX_ATTEMPTS', default=5, cast=int)
+TASK_POLL_INTERVAL = config('TASK_POLL_INTERVAL', default=5.0, cast=float)
+TASK_STALE_AFTER = config('TASK_STALE_AFTER', default=600, cast=int)
+# Start the thread backend's pool and scheduler when a server process boots
+TASK_AUTOSTART = config('TASK_AUTOSTART', default=True, cast=bool)
+
+# Side effects (emails) are written to an outbox in the request's transaction
+# and published to the task backend in batches by the relay
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=200, cast=int)
+OUTBOX_RELAY_INTERVAL = config('OUTBOX_RELAY_INTERVAL', default=2.0, cast=float)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=10, cast=int)
+
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'refresh-admin-reports': {
+        'task': 'reports.tasks.refresh_admin_report',
+        'schedule': 300.0,
+    },
+    'refresh-daily-metrics': {
+        'task': 'reports.tasks.refresh_daily_metrics',
+        'schedule': 900.0,
+    },
+    'relay-outbox': {
+        'task': 'notifications.tasks.relay_outbox',
+        'schedule': OUTBOX_RELAY_INTERVAL,
+    },
+    'flush-email-queue': {
+        'task': 'notifications.tasks.flush_email_queue',
+        'schedule': EMAIL_FLUSH_INTERVAL,
+    },
+    'purge-sent-emails': {
+        'task': 'notifications.tasks.purge_sent_emails',
+        'schedule': 86400.0,
+    },
+}
+
+# Cache configuration - Redis when CACHE_URL is set, per-process memory otherwise
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+# Only a shared cache sees invalidations made in other worker processes, so
+# entries that must not outlive a write (auth, access scopes, counters) are
+# only cached when it is configured
+CACHE_SHARED = bool(CACHE_URL)
+
+# Admin reports snapshot: served from cache, refreshed in the background once stale
+ADMIN_REPORTS_STALE_AFTER = config('ADMIN_REPORTS_STALE_AFTER', default=300, cast=int)
+ADMIN_REPORTS_CACHE_TIMEOUT = config('ADMIN_REPORTS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# The incremental DailyMetric refresh re-reads rows updated this many seconds
+# before its previous run, so transactions that committed after it are not missed
+DAILY_METRICS_WATERMARK_MARGIN = config('DAILY_METRICS_WATERMARK_MARGIN', default=300, cast=int)
+
+# QR token state is cached for the scan hot path; revocations clear it, the
+# timeout bounds staleness when each worker process has its own memory cache
+QR_TOKEN_CACHE_TIMEOUT = config('QR_TOKEN_CACHE_TIMEOUT', default=30, cast=int)
+# Rotating kiosk codes change every QR_ROTATION_INTERVAL seconds; codes up to
+# QR_ROTATION_GRACE_STEPS intervals old are still accepted
+QR_ROTATION_INTERVAL = config('QR_ROTATION_INTERVAL', default=30, cast=int)
+QR_ROTATION_GRACE_STEPS = config('QR_ROTATION_GRACE_STEPS', default=1, cast=int)
+
+# Server-sent event streams: cache poll interval and how long one connection is
+# held before the client reconnects. A stream occupies its worker for that long
+# and watches cache counters, so streams are only served with a shared cache
+# (CACHE_URL) and STREAMING_ENABLED set for an async worker class (e.g. gunicorn
+# -k gevent). Otherwise the stream endpoints answer 503 and clients poll.
+STREAMING_ENABLED = CACHE_SHARED and config('STREAMING_ENABLED', default=False, cast=bool)
+STREAM_POLL_INTERVAL = config('STREAM_POLL_INTERVAL', default=1.0, cast=float)
+STREAM_MAX_SECONDS = config('STREAM_MAX_SECONDS', default=300, cast=int)
+
+# Per-user unread notification counts are kept in the shared cache and adjusted
+# on writes; the timeout bounds drift if an update bypasses the helpers
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = config('NOTIFICATION_UNREAD_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Token -> user snapshots used by CachedTokenAuthentication (shared cache only);
+# logout, role changes, deactivation and password changes drop them explicitly
+TOKEN_AUTH_CACHE_TIMEOUT = config('TOKEN_AUTH_CACHE_TIMEOUT', default=60, cast=int)
+
+# Each supervisor's assigned intern ids; assignment saves and deletes clear it.
+# The scope authorizes access and the clears only reach other workers through
+# a shared cache, so the per-process cache keeps it for a few seconds only
+SUPERVISOR_SCOPE_CACHE_TIMEOUT = config('SUPERVISOR_SCOPE_CACHE_TIMEOUT',
+                                        default=300 if CACHE_SHARED else 5, cast=int)
+
+# Per-user intern/supervisor dashboards; task, attendance, leave and review
+# writes clear the affected entries, the timeout covers the daily rollup
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=60, cast=int)
 
 # Frontend URL for password reset links
 FRONTEND_URL = config('FRONTEND_URL', default='https://intern-management-system-5q9u.vercel.app')
@@ -0,0 +1,65 @@
+"""Server-sent events helpers.
+
+A stream calls a cheap poll function (normally a few cache reads) every
+STREAM_POLL_INTERVAL seconds and only sends a frame when something changed.
+Each open stream occupies a worker thread, so streams end after
+STREAM_MAX_SECONDS and the client reconnects. Streams are off unless
+STREAMING_ENABLED; the endpoints then answer 503 and clients fall back to
+polling the matching JSON endpoint.
+"""
+import json
+import time
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+
+HEARTBEAT_SECONDS = 15
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets clients send Accept: text/event-stream; only error responses are rendered here."""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event('error', data).encode(self.charset)
+
+
+def format_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+def event_stream(poll):
+    """Yield SSE frames for the (event, data) pairs poll() returns on each tick."""
+    interval = settings.STREAM_POLL_INTERVAL
+    started = last_sent = time.monotonic()
+    yield 'retry: 3000\n\n'
+    while True:
+        for event, data in poll():
+            yield format_event(event, data)
+            last_sent = time.monotonic()
+        now = time.monotonic()
+        if now - started >= settings.STREAM_MAX_SECONDS:
+            return
+        if now - last_sent >= HEARTBEAT_SECONDS:
+            yield ': keep-alive\n\n'
+            last_sent = now
+        time.sleep(interval)
+
+
+def streams_unavailable():
+    """Response for stream endpoints when STREAMING_ENABLED is off; clients poll instead."""
+    return Response({'error': 'Event streams are not enabled on this server'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+def sse_response(stream):
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
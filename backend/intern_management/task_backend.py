@@ -0,0 +1,213 @@
+"""Pluggable background task backend.
+
+Task modules decorate functions with @task and call .delay() as with Celery.
+TASK_BACKEND picks where they run:
+
+- 'celery': Celery's shared_task (requires a broker).
+- 'thread': a bounded in-process thread pool. Every .delay() is first stored as
+  a BackgroundTask row, so work survives restarts and failures are retried
+  with backoff until TASK_MAX_ATTEMPTS. A scheduler thread re-dispatches due
+  rows and runs the interval entries of CELERY_BEAT_SCHEDULE. Every serving
+  process starts one at boot (NotificationsConfig.ready); each periodic run is
+  claimed in the PeriodicTaskRun table, so only one process starts it.
+- 'auto' (default): celery when it is installed and REDIS_URL is set,
+  otherwise thread.
+
+With celery, run exactly one `celery beat` process for the schedule.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    shared_task = None
+
+
+def get_backend():
+    backend = settings.TASK_BACKEND
+    if backend == 'auto':
+        return 'celery' if shared_task is not None and settings.TASK_BROKER_CONFIGURED else 'thread'
+    return backend
+
+
+def task(func):
+    """Register a background task; call it with .delay(*args, **kwargs)."""
+    if get_backend() == 'celery':
+        return shared_task(func)
+    func.delay = lambda *args, **kwargs: enqueue(f'{func.__module__}.{func.__name__}', args, kwargs)
+    return func
+
+
+def enqueue(name, args=(), kwargs=None):
+    """Persist a task and hand it to the pool once the surrounding transaction commits."""
+    from notifications.models import BackgroundTask
+
+    record = BackgroundTask.objects.create(
+        name=name, args=list(args), kwargs=kwargs or {}, run_after=timezone.now(),
+    )
+    transaction.on_commit(lambda: _runner.submit(record.pk))
+    return record
+
+
+def run_task(task_id):
+    """Claim and run one BackgroundTask; return True if it ran successfully."""
+    from notifications.models import BackgroundTask
+
+    claimed = BackgroundTask.objects.filter(
+        pk=task_id, status='pending', run_after__lte=timezone.now()
+    # update() skips auto_now; the stale sweep measures a run from updated_at
+    ).update(status='running', attempts=F('attempts') + 1, updated_at=timezone.now())
+    if not claimed:
+        return False
+    record = BackgroundTask.objects.get(pk=task_id)
+    try:
+        module_name, func_name = record.name.rsplit('.', 1)
+        func = getattr(import_module(module_name), func_name)
+        func(*record.args, **record.kwargs)
+    except Exception as exc:
+        logger.exception('Background task %s failed', record.name)
+        failed = record.attempts >= settings.TASK_MAX_ATTEMPTS
+        BackgroundTask.objects.filter(pk=task_id).update(
+            status='failed' if failed else 'pending',
+            last_error=repr(exc),
+            updated_at=timezone.now(),
+            # Exponential backoff: 30s, 60s, 120s, ...
+            run_after=timezone.now() + timedelta(seconds=30 * 2 ** (record.attempts - 1)),
+        )
+        return False
+    BackgroundTask.objects.filter(pk=task_id).delete()
+    return True
+
+
+def requeue_stale_tasks():
+    """Return 'running' rows orphaned by a process that died to 'pending'; return how many."""
+    from notifications.models import BackgroundTask
+
+    now = timezone.now()
+    # A 'running' row untouched for this long belongs to a process that died
+    return BackgroundTask.objects.filter(
+        status='running', updated_at__lt=now - timedelta(seconds=settings.TASK_STALE_AFTER)
+    ).update(status='pending', updated_at=now)
+
+
+def run_due_tasks(limit=100):
+    """Run pending tasks whose time has come and requeue ones orphaned mid-run; return the count run."""
+    from notifications.models import BackgroundTask
+
+    requeue_stale_tasks()
+    now = timezone.now()
+    due = BackgroundTask.objects.filter(status='pending', run_after__lte=now).values_list('pk', flat=True)[:limit]
+    return sum(run_task(task_id) for task_id in due)
+
+
+def register_periodic_tasks():
+    """Create the PeriodicTaskRun rows the schedulers claim runs on."""
+    from notifications.models import PeriodicTaskRun
+
+    PeriodicTaskRun.objects.bulk_create(
+        [PeriodicTaskRun(name=name) for name in settings.CELERY_BEAT_SCHEDULE],
+        ignore_conflicts=True,
+    )
+
+
+def claim_periodic_run(name, interval):
+    """Claim the next run of a schedule entry; one caller across all processes wins per interval."""
+    from notifications.models import PeriodicTaskRun
+
+    now = timezone.now()
+    return bool(PeriodicTaskRun.objects.filter(name=name).filter(
+        Q(last_run_at__isnull=True) | Q(last_run_at__lte=now - timedelta(seconds=interval))
+    ).update(last_run_at=now))
+
+
+class ThreadRunner:
+    """Bounded pool plus one scheduler thread per process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.TASK_THREAD_WORKERS, thread_name_prefix='task'
+                )
+                # Queue at most this many in memory; the rest wait in the table
+                self._slots = threading.BoundedSemaphore(settings.TASK_THREAD_WORKERS * 4)
+                threading.Thread(target=self._schedule, name='task-scheduler', daemon=True).start()
+
+    def submit(self, task_id):
+        self.start()
+        if not self._slots.acquire(blocking=False):
+            return  # pool saturated; the scheduler picks the row up later
+        self._executor.submit(self._run, task_id)
+
+    def _run(self, task_id):
+        try:
+            run_task(task_id)
+        except Exception:
+            logger.exception('Background task %s could not be run', task_id)
+        finally:
+            close_old_connections()
+            self._slots.release()
+
+    def _schedule(self):
+        registered = False
+        while True:
+            time.sleep(settings.TASK_POLL_INTERVAL)
+            try:
+                if not registered:
+                    register_periodic_tasks()
+                    registered = True
+                for name, entry in settings.CELERY_BEAT_SCHEDULE.items():
+                    interval = entry['schedule']
+                    if not isinstance(interval, (int, float)):
+                        continue  # crontab schedules need celery beat
+                    if claim_periodic_run(name, interval):
+                        enqueue(entry['task'], entry.get('args', ()), entry.get('kwargs'))
+                requeue_stale_tasks()
+                from notifications.models import BackgroundTask
+                due = BackgroundTask.objects.filter(
+                    status='pending', run_after__lte=timezone.now()
+                ).values_list('pk', flat=True)[:settings.TASK_THREAD_WORKERS * 4]
+                for task_id in due:
+                    self.submit(task_id)
+            except Exception:
+                logger.exception('Task scheduler tick failed')
+            finally:
+                close_old_connections()
+
+
+_runner = ThreadRunner()
+
+
+def start_worker():
+    """Start the thread backend's pool and scheduler in a process that serves requests.
+
+    Called from NotificationsConfig.ready(). Other management commands (migrate,
+    shell, the benchmarks) and the autoreloader's parent skip it; they still
+    start the pool lazily if they enqueue something.
+    """
+    if get_backend() != 'thread' or not settings.TASK_AUTOSTART:
+        return
+    if os.path.basename(sys.argv[0]) == 'manage.py':
+        command = sys.argv[1] if len(sys.argv) > 1 else ''
+        reloader_child = os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+        if command != 'runserver' or not reloader_child:
+            return
+    _runner.start()
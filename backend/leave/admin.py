@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LeaveType, LeaveRequest, LeaveRequestHistory
+from .models import LeaveType, LeaveRequest, LeaveRequestHistory, LeaveBalanceLedger
 
 @admin.register(LeaveType)
 class LeaveTypeAdmin(admin.ModelAdmin):
@@ -12,4 +12,9 @@ class LeaveRequestAdmin(admin.ModelAdmin):
 
 @admin.register(LeaveRequestHistory)
 class LeaveRequestHistoryAdmin(admin.ModelAdmin):
-    list_display = ('leave_request', 'status', 'changed_by', 'changed_at')
\ No newline at end of file
+    list_display = ('leave_request', 'status', 'changed_by', 'changed_at')
+
+@admin.register(LeaveBalanceLedger)
+class LeaveBalanceLedgerAdmin(admin.ModelAdmin):
+    list_display = ('user', 'leave_type', 'year', 'used_days', 'updated_at')
+    list_filter = ('year', 'leave_type')
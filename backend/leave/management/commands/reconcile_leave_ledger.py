@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from leave.utils import rebuild_leave_ledger
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the LeaveBalanceLedger from LeaveRequest history, rewriting only entries that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Only reconcile this year (default: every year)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how many entries are out of step without changing them')
+
+    def handle(self, *args, **options):
+        drifted = rebuild_leave_ledger(year=options['year'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{drifted} ledger entries out of step with leave history')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Reconciled leave ledger: {drifted} entries rewritten'))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0002_leaverequest_supervisor_notes_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['applicant', '-created_at', '-id'], name='leave_applicant_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['-created_at', '-id'], name='leave_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequesthistory',
+            index=models.Index(fields=['leave_request', '-changed_at', '-id'], name='leavehistory_request_keyset'),
+        ),
+    ]
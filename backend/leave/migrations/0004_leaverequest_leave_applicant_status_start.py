@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0003_leaverequest_leave_applicant_keyset_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['applicant', 'status', 'start_date'], name='leave_applicant_status_start'),
+        ),
+    ]
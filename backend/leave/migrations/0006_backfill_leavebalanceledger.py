@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractYear
+
+
+def backfill_ledger(apps, schema_editor):
+    LeaveRequest = apps.get_model('leave', 'LeaveRequest')
+    LeaveBalanceLedger = apps.get_model('leave', 'LeaveBalanceLedger')
+    rows = LeaveRequest.objects.filter(
+        status__in=['approved', 'supervisor_approved'],
+    ).order_by().annotate(year=ExtractYear('start_date')).values(
+        'applicant_id', 'leave_type_id', 'year',
+    ).annotate(span=Sum(F('end_date') - F('start_date')), requests=Count('id'))
+    LeaveBalanceLedger.objects.bulk_create([
+        LeaveBalanceLedger(user_id=row['applicant_id'], leave_type_id=row['leave_type_id'],
+                           year=row['year'], used_days=row['span'].days + row['requests'])
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0005_leavebalanceledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+# Expression must match leave.utils.overlapping for the planner to use the index
+CREATE_SQL = (
+    "CREATE INDEX IF NOT EXISTS leave_period_gist ON leave_leaverequest "
+    "USING gist (daterange(start_date, end_date, '[]'))"
+)
+DROP_SQL = 'DROP INDEX IF EXISTS leave_period_gist'
+
+
+def create_period_index(apps, schema_editor):
+    # Range types and GiST are PostgreSQL-only; other backends keep the btree indexes
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0006_backfill_leavebalanceledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_period_index, drop_period_index),
+    ]
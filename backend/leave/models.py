@@ -37,6 +37,13 @@ class LeaveRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Keyset pagination (intern_management.pagination): per applicant and across all requests
+        indexes = [
+            models.Index(fields=['applicant', '-created_at', '-id'], name='leave_applicant_keyset'),
+            models.Index(fields=['-created_at', '-id'], name='leave_keyset'),
+            # Leave balances: an applicant's approved requests in a year
+            models.Index(fields=['applicant', 'status', 'start_date'], name='leave_applicant_status_start'),
+        ]
 
     def __str__(self):
         return f"{self.applicant.email} - {self.leave_type.name} ({self.start_date} to {self.end_date})"
@@ -46,6 +53,27 @@ class LeaveRequest(models.Model):
         return (self.end_date - self.start_date).days + 1
 
 
+class LeaveBalanceLedger(models.Model):
+    """Days of leave used per user, leave type and year.
+
+    Kept in step with LeaveRequest by leave.utils.update_ledger inside the
+    review actions; reconcile_leave_ledger rebuilds it from history. Remaining
+    days are max_days_per_year minus used_days, so changing a type's allowance
+    needs no rewrite.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='leave_ledger')
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.CASCADE, related_name='ledger_entries')
+    year = models.PositiveSmallIntegerField()
+    used_days = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'year', 'leave_type']
+
+    def __str__(self):
+        return f"{self.user_id} - {self.leave_type_id} ({self.year}): {self.used_days} days"
+
+
 class LeaveRequestHistory(models.Model):
     leave_request = models.ForeignKey(LeaveRequest, on_delete=models.CASCADE, related_name='status_history')
     status = models.CharField(max_length=20)
@@ -55,6 +83,8 @@ class LeaveRequestHistory(models.Model):
 
     class Meta:
         ordering = ['-changed_at']
+        # Serves LeaveRequestViewSet's status_history prefetch in its ordering
+        indexes = [models.Index(fields=['leave_request', '-changed_at', '-id'], name='leavehistory_request_keyset')]
 
     def __str__(self):
         return f"Leave {self.leave_request_id} -> {self.status}"
\ No newline at end of file
@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
 from .models import LeaveType, LeaveRequest, LeaveRequestHistory
+from .utils import ACTIVE_STATUSES, overlapping
 
 
 class LeaveTypeSerializer(serializers.ModelSerializer):
@@ -46,10 +49,21 @@ class LeaveRequestCreateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         if attrs['end_date'] < attrs['start_date']:
             raise serializers.ValidationError("End date must be after start date")
+        self._check_overlap(self.context['request'].user, attrs['start_date'], attrs['end_date'])
         return attrs
 
+    def _check_overlap(self, user, start_date, end_date):
+        active = LeaveRequest.objects.filter(applicant=user, status__in=ACTIVE_STATUSES)
+        if overlapping(active, start_date, end_date).exists():
+            raise serializers.ValidationError("You already have a leave request overlapping these dates")
+
+    @transaction.atomic
     def create(self, validated_data):
-        validated_data['applicant'] = self.context['request'].user
+        user = self.context['request'].user
+        # Serialise concurrent submissions by the same user, then re-check under the lock
+        get_user_model().objects.select_for_update().filter(pk=user.pk).exists()
+        self._check_overlap(user, validated_data['start_date'], validated_data['end_date'])
+        validated_data['applicant'] = user
         request = super().create(validated_data)
         LeaveRequestHistory.objects.create(
             leave_request=request,
@@ -61,7 +75,14 @@ class LeaveRequestCreateSerializer(serializers.ModelSerializer):
 
 
 class LeaveBalanceSerializer(serializers.Serializer):
+    leave_type = serializers.IntegerField()
     leave_type_name = serializers.CharField()
     max_days = serializers.IntegerField()
     used_days = serializers.IntegerField()
-    remaining_days = serializers.IntegerField()
\ No newline at end of file
+    remaining_days = serializers.IntegerField()
+
+
+class InternLeaveBalanceSerializer(serializers.Serializer):
+    intern = serializers.IntegerField(source='id')
+    intern_name = serializers.CharField(source='get_full_name')
+    balances = LeaveBalanceSerializer(many=True)
@@ -0,0 +1,177 @@
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Count, F, Func, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, ExtractYear
+from django.utils import timezone
+from .models import LeaveType, LeaveRequest, LeaveBalanceLedger
+
+# Requests that use up allowance; a request counts against the year it starts in
+USED_STATUSES = ('approved', 'supervisor_approved')
+# Requests that block another request for the same dates
+ACTIVE_STATUSES = ('pending', 'supervisor_approved', 'approved')
+# Longest window team_availability will expand day by day
+MAX_AVAILABILITY_DAYS = 92
+
+LeaveUsage = namedtuple('LeaveUsage', ['user_id', 'leave_type_id', 'year', 'days'])
+
+
+def leave_usage(leave_request):
+    """The ledger entry a request contributes to, or None if it uses no allowance."""
+    if leave_request.status not in USED_STATUSES:
+        return None
+    return LeaveUsage(leave_request.applicant_id, leave_request.leave_type_id,
+                      leave_request.start_date.year, leave_request.days_count)
+
+
+def _adjust_ledger(usage, sign):
+    entry, _ = LeaveBalanceLedger.objects.get_or_create(
+        user_id=usage.user_id, leave_type_id=usage.leave_type_id, year=usage.year,
+    )
+    LeaveBalanceLedger.objects.filter(pk=entry.pk).update(used_days=F('used_days') + sign * usage.days)
+
+
+def update_ledger(before, after):
+    """Move a request's usage in the ledger from `before` to `after` (leave_usage() snapshots).
+
+    Call inside the transaction that saves the request, with the snapshot
+    taken before the change.
+    """
+    if before == after:
+        return
+    if before is not None:
+        _adjust_ledger(before, -1)
+    if after is not None:
+        _adjust_ledger(after, 1)
+
+
+def overlapping(queryset, start_date, end_date):
+    """Filter LeaveRequests whose period intersects the inclusive window [start_date, end_date].
+
+    On PostgreSQL this is daterange(start_date, end_date, '[]') && window, the
+    expression the leave_period_gist index is built on; other backends compare
+    the end points.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.filter(start_date__lte=end_date, end_date__gte=start_date)
+
+    from django.contrib.postgres.fields import DateRangeField
+    from django.db.backends.postgresql.psycopg_any import DateRange
+
+    period = Func(F('start_date'), F('end_date'), function='daterange',
+                  template="%(function)s(%(expressions)s, '[]')", output_field=DateRangeField())
+    return queryset.annotate(period=period).filter(period__overlap=DateRange(start_date, end_date, '[]'))
+
+
+def team_absences(intern_ids, start_date, end_date):
+    """Return {date: set of intern ids on leave} for each day of an inclusive window.
+
+    One query fetches the overlapping approved and supervisor-approved periods;
+    they are expanded into days here.
+    """
+    absent = {start_date + timedelta(days=n): set() for n in range((end_date - start_date).days + 1)}
+    periods = overlapping(
+        LeaveRequest.objects.filter(applicant_id__in=intern_ids, status__in=USED_STATUSES),
+        start_date, end_date,
+    ).order_by().values_list('applicant_id', 'start_date', 'end_date')
+    for applicant_id, period_start, period_end in periods:
+        day = max(period_start, start_date)
+        while day <= min(period_end, end_date):
+            absent[day].add(applicant_id)
+            day += timedelta(days=1)
+    return absent
+
+
+def _usage_rows(queryset):
+    """Grouped (applicant, leave type, year) -> days used over a LeaveRequest queryset.
+
+    Days are inclusive, like LeaveRequest.days_count: the summed
+    end_date - start_date spans plus one day per request.
+    """
+    rows = queryset.filter(status__in=USED_STATUSES).order_by().annotate(
+        year=ExtractYear('start_date'),
+    ).values('applicant_id', 'leave_type_id', 'year').annotate(
+        span=Sum(F('end_date') - F('start_date')), requests=Count('id'),
+    )
+    return {
+        (row['applicant_id'], row['leave_type_id'], row['year']): row['span'].days + row['requests']
+        for row in rows
+    }
+
+
+def used_days(user_ids, year):
+    """Return {(user_id, leave_type_id): days used} from the ledger."""
+    return {
+        (user_id, leave_type_id): days
+        for user_id, leave_type_id, days in LeaveBalanceLedger.objects.filter(
+            user_id__in=user_ids, year=year,
+        ).values_list('user_id', 'leave_type_id', 'used_days')
+    }
+
+
+def leave_balances(user_ids, year=None):
+    """Return {user_id: [balance per leave type]} for a set of users (two queries in total)."""
+    year = year or timezone.now().year
+    leave_types = list(LeaveType.objects.order_by('id'))
+    used = used_days(user_ids, year)
+    balances = defaultdict(list)
+    for user_id in user_ids:
+        for lt in leave_types:
+            balances[user_id].append(_balance(lt, used.get((user_id, lt.id), 0)))
+    return balances
+
+
+def leave_balance(user, year=None):
+    """Balance per leave type for one user, in one query (leave types joined to the ledger)."""
+    year = year or timezone.now().year
+    used = LeaveBalanceLedger.objects.filter(
+        user_id=user.pk, year=year, leave_type=OuterRef('pk'),
+    ).values('used_days')[:1]
+    leave_types = LeaveType.objects.order_by('id').annotate(used=Coalesce(Subquery(used), 0))
+    return [_balance(lt, lt.used) for lt in leave_types]
+
+
+def _balance(leave_type, days):
+    return {
+        'leave_type': leave_type.id,
+        'leave_type_name': leave_type.name,
+        'max_days': leave_type.max_days_per_year,
+        'used_days': days,
+        'remaining_days': max(0, leave_type.max_days_per_year - days),
+    }
+
+
+@transaction.atomic
+def rebuild_leave_ledger(year=None, dry_run=False):
+    """Recompute the ledger from LeaveRequest history in one grouped query.
+
+    Returns the number of ledger entries that were wrong or missing. Only
+    those are rewritten (unless dry_run); entries with no usage are removed.
+    """
+    requests = LeaveRequest.objects.all()
+    ledger = LeaveBalanceLedger.objects.select_for_update()
+    if year is not None:
+        requests = requests.filter(start_date__year=year)
+        ledger = ledger.filter(year=year)
+
+    expected = _usage_rows(requests)
+    current = {
+        (entry.user_id, entry.leave_type_id, entry.year): entry
+        for entry in ledger
+    }
+    stale = [entry for key, entry in current.items() if key not in expected and entry.used_days]
+    wrong, missing = [], []
+    now = timezone.now()
+    for key, days in expected.items():
+        entry = current.get(key)
+        if entry is None:
+            missing.append(LeaveBalanceLedger(user_id=key[0], leave_type_id=key[1], year=key[2], used_days=days))
+        elif entry.used_days != days:
+            entry.used_days, entry.updated_at = days, now
+            wrong.append(entry)
+
+    if not dry_run:
+        LeaveBalanceLedger.objects.filter(pk__in=[entry.pk for entry in stale]).delete()
+        LeaveBalanceLedger.objects.bulk_update(wrong, ['used_days', 'updated_at'], batch_size=1000)
+        LeaveBalanceLedger.objects.bulk_create(missing, batch_size=1000)
+    return len(stale) + len(wrong) + len(missing)
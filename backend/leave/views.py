@@ -1,14 +1,21 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from django.utils import timezone
+from datetime import datetime, timedelta
+from intern_management.pagination import SelectablePagination
 from intern_management.permissions import IsAdminOrSupervisor
-from accounts.models import SupervisorAssignment, User
+from accounts.models import User
+from accounts.utils import get_supervised_intern_ids, supervises
 from .models import LeaveType, LeaveRequest, LeaveRequestHistory
 from .serializers import (LeaveTypeSerializer, LeaveRequestSerializer,
-                          LeaveRequestCreateSerializer, LeaveBalanceSerializer)
-from notifications.utils import send_notification
+                          LeaveRequestCreateSerializer, LeaveBalanceSerializer,
+                          InternLeaveBalanceSerializer)
+from .utils import (MAX_AVAILABILITY_DAYS, leave_balance, leave_balances, leave_usage,
+                    team_absences, update_ledger)
+from notifications.utils import send_notification, send_bulk_notification, defer_task
 
 
 class LeaveTypeViewSet(viewsets.ReadOnlyModelViewSet):
@@ -17,17 +24,35 @@ class LeaveTypeViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
+def _with_serializer_relations(queryset):
+    """Load what LeaveRequestSerializer reads: the named users, the type and the status history."""
+    return queryset.select_related(
+        'applicant', 'leave_type', 'reviewed_by', 'supervisor_reviewed_by',
+    ).prefetch_related(
+        Prefetch('status_history', queryset=LeaveRequestHistory.objects.select_related('changed_by')),
+    )
+
+
 class LeaveRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
+    # Actions that move the ledger read the request under a row lock, so two
+    # concurrent reviews of the same request apply one after the other
+    locked_actions = {'update', 'partial_update', 'destroy', 'supervisor_approve',
+                      'supervisor_reject', 'approve', 'reject'}
 
     def get_queryset(self):
+        queryset = _with_serializer_relations(self._visible_requests())
+        if self.action in self.locked_actions:
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
+
+    def _visible_requests(self):
         user = self.request.user
         if user.role == 'admin':
             return LeaveRequest.objects.all()
         if user.role == 'supervisor':
-            intern_ids = SupervisorAssignment.objects.filter(
-                supervisor=user
-            ).values_list('intern_id', flat=True)
+            intern_ids = get_supervised_intern_ids(user)
             # Use Q objects instead of QuerySet union (|) to preserve
             # filtering, ordering, and pagination capabilities.
             # Fallback: if no assignments exist yet, show all intern requests
@@ -47,6 +72,25 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
             return LeaveRequestCreateSerializer
         return LeaveRequestSerializer
 
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        usage_before = leave_usage(serializer.instance)
+        leave_request = serializer.save()
+        update_ledger(usage_before, leave_usage(leave_request))
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        update_ledger(leave_usage(instance), None)
+        instance.delete()
+
     def _validate_supervisor_intern(self, supervisor, intern):
         """Check if the supervisor is assigned to this intern.
 
@@ -54,22 +98,16 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         allow them to act on any intern (so the system is usable
         before assignments are created).
         """
-        assignments_exist = SupervisorAssignment.objects.filter(
-            supervisor=supervisor
-        ).exists()
-        if not assignments_exist:
-            return True
-        return SupervisorAssignment.objects.filter(
-            supervisor=supervisor, intern=intern
-        ).exists()
+        return supervises(supervisor, intern)
 
     @action(detail=False, methods=['get'])
     def my_leave_requests(self, request):
-        requests = LeaveRequest.objects.filter(applicant=request.user)
+        requests = _with_serializer_relations(LeaveRequest.objects.filter(applicant=request.user))
         serializer = LeaveRequestSerializer(requests, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def supervisor_approve(self, request, pk=None):
         """Supervisor approves a pending leave request (first step in two-step flow)."""
         if request.user.role != 'supervisor':
@@ -92,11 +130,13 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        usage_before = leave_usage(leave_request)
         leave_request.status = 'supervisor_approved'
         leave_request.supervisor_reviewed_by = request.user
         leave_request.supervisor_reviewed_at = timezone.now()
         leave_request.supervisor_notes = request.data.get('supervisor_notes', '')
         leave_request.save()
+        update_ledger(usage_before, leave_usage(leave_request))
 
         LeaveRequestHistory.objects.create(
             leave_request=leave_request, status='supervisor_approved',
@@ -115,28 +155,23 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         )
 
         # Notify all admins
-        admin_users = User.objects.filter(role='admin', is_active=True)
-        for admin in admin_users:
-            send_notification(
-                recipient=admin,
-                title='Leave Request Awaiting Final Approval',
-                message=f'Leave request from {leave_request.applicant.get_full_name()} ({leave_request.start_date} to {leave_request.end_date}) has been supervisor-approved and awaits your final approval.',
-                notification_type='leave_request',
-                related_object_id=leave_request.id,
-                related_object_type='leave_request',
-            )
+        send_bulk_notification(
+            recipients=User.objects.filter(role='admin', is_active=True),
+            title='Leave Request Awaiting Final Approval',
+            message=f'Leave request from {leave_request.applicant.get_full_name()} ({leave_request.start_date} to {leave_request.end_date}) has been supervisor-approved and awaits your final approval.',
+            notification_type='leave_request',
+            related_object_id=leave_request.id,
+            related_object_type='leave_request',
+        )
 
         # Send email notification
-        try:
-            from notifications.tasks import send_leave_request_email
-            send_leave_request_email.delay(leave_request.id)
-        except Exception:
-            pass
+        defer_task('notifications.tasks.send_leave_request_email', leave_request.id)
 
         serializer = LeaveRequestSerializer(leave_request)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def supervisor_reject(self, request, pk=None):
         """Supervisor rejects a pending leave request."""
         if request.user.role != 'supervisor':
@@ -159,6 +194,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        usage_before = leave_usage(leave_request)
         leave_request.status = 'rejected'
         leave_request.supervisor_reviewed_by = request.user
         leave_request.supervisor_reviewed_at = timezone.now()
@@ -167,6 +203,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         leave_request.reviewed_at = timezone.now()
         leave_request.admin_notes = request.data.get('supervisor_notes', '')
         leave_request.save()
+        update_ledger(usage_before, leave_usage(leave_request))
 
         LeaveRequestHistory.objects.create(
             leave_request=leave_request, status='rejected',
@@ -187,6 +224,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def supervisor_comment(self, request, pk=None):
         """Supervisor or admin adds a comment on a pending leave request without changing status."""
         if request.user.role not in ('supervisor', 'admin'):
@@ -241,6 +279,7 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def approve(self, request, pk=None):
         """Admin gives final approval to a supervisor-approved leave request."""
         if request.user.role != 'admin':
@@ -257,11 +296,13 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        usage_before = leave_usage(leave_request)
         leave_request.status = 'approved'
         leave_request.reviewed_by = request.user
         leave_request.reviewed_at = timezone.now()
         leave_request.admin_notes = request.data.get('admin_notes', '')
         leave_request.save()
+        update_ledger(usage_before, leave_usage(leave_request))
 
         LeaveRequestHistory.objects.create(
             leave_request=leave_request, status='approved',
@@ -278,16 +319,13 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
             related_object_type='leave_request',
         )
 
-        try:
-            from notifications.tasks import send_leave_request_email
-            send_leave_request_email.delay(leave_request.id)
-        except Exception:
-            pass
+        defer_task('notifications.tasks.send_leave_request_email', leave_request.id)
 
         serializer = LeaveRequestSerializer(leave_request)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def reject(self, request, pk=None):
         """Admin rejects a supervisor-approved leave request."""
         if request.user.role != 'admin':
@@ -304,11 +342,13 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        usage_before = leave_usage(leave_request)
         leave_request.status = 'rejected'
         leave_request.reviewed_by = request.user
         leave_request.reviewed_at = timezone.now()
         leave_request.admin_notes = request.data.get('admin_notes', '')
         leave_request.save()
+        update_ledger(usage_before, leave_usage(leave_request))
 
         LeaveRequestHistory.objects.create(
             leave_request=leave_request, status='rejected',
@@ -330,26 +370,66 @@ class LeaveRequestViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def leave_balance(self, request):
-        current_year = timezone.now().year
-        leave_types = LeaveType.objects.all()
-        balances = []
-
-        for lt in leave_types:
-            used = LeaveRequest.objects.filter(
-                applicant=request.user,
-                leave_type=lt,
-                status__in=['approved', 'supervisor_approved'],
-                start_date__year=current_year,
-            ).count()
-            balances.append({
-                'leave_type_name': lt.name,
-                'max_days': lt.max_days_per_year,
-                'used_days': used,
-                'remaining_days': max(0, lt.max_days_per_year - used),
-            })
-
-        serializer = LeaveBalanceSerializer(balances, many=True)
+        serializer = LeaveBalanceSerializer(leave_balance(request.user), many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminOrSupervisor])
+    def intern_balances(self, request):
+        """Leave balances for the supervisor's interns (all active interns for admins), paginated."""
+        interns = User.objects.filter(role='intern', is_active=True)
+        if request.user.role == 'supervisor':
+            intern_ids = get_supervised_intern_ids(request.user)
+            # Same fallback as the request list: no assignments yet means every intern
+            if intern_ids:
+                interns = interns.filter(id__in=intern_ids)
+        interns = interns.order_by('-created_at', '-id')
+
+        page = self.paginate_queryset(interns)
+        interns = page if page is not None else list(interns)
+        balances = leave_balances([intern.id for intern in interns])
+        for intern in interns:
+            intern.balances = balances[intern.id]
+        serializer = InternLeaveBalanceSerializer(interns, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminOrSupervisor])
+    def team_availability(self, request):
+        """Per-day count of the supervisor's interns on approved leave (all interns for admins).
+
+        Query params: start_date / end_date (YYYY-MM-DD, default the next 14 days).
+        """
+        today = timezone.now().date()
+        try:
+            start_date = datetime.strptime(request.query_params.get('start_date', today.isoformat()), '%Y-%m-%d').date()
+            end_date = datetime.strptime(
+                request.query_params.get('end_date', (start_date + timedelta(days=13)).isoformat()), '%Y-%m-%d'
+            ).date()
+        except ValueError:
+            return Response({'error': 'Invalid date range'}, status=status.HTTP_400_BAD_REQUEST)
+        if end_date < start_date:
+            return Response({'error': 'end_date must not be before start_date'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if (end_date - start_date).days >= MAX_AVAILABILITY_DAYS:
+            return Response({'error': f'Date range cannot exceed {MAX_AVAILABILITY_DAYS} days'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        intern_ids = get_supervised_intern_ids(request.user) if request.user.role == 'supervisor' else None
+        if not intern_ids:
+            # Admins, and supervisors without assignments yet, see every active intern
+            intern_ids = set(User.objects.filter(role='intern', is_active=True).values_list('id', flat=True))
+
+        absences = team_absences(intern_ids, start_date, end_date)
+        return Response({
+            'start_date': start_date,
+            'end_date': end_date,
+            'team_size': len(intern_ids),
+            'days': [
+                {'date': day, 'on_leave': len(ids), 'interns': sorted(ids)}
+                for day, ids in absences.items()
+            ],
+        })
+
     filterset_fields = ['status', 'leave_type', 'applicant']
     ordering = ['-created_at']
\ No newline at end of file
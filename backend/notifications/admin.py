@@ -1,9 +1,33 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, QueuedEmail, BackgroundTask, PeriodicTaskRun, OutboxMessage
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('title', 'recipient', 'notification_type', 'is_read', 'created_at')
     list_filter = ('notification_type', 'is_read', 'created_at')
-    search_fields = ('title', 'message', 'recipient__email')
\ No newline at end of file
+    search_fields = ('title', 'message', 'recipient__email')
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'created_at', 'sent_at', 'attempts')
+    list_filter = ('sent_at', 'created_at')
+    search_fields = ('subject', 'to')
+
+
+@admin.register(BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+
+
+@admin.register(PeriodicTaskRun)
+class PeriodicTaskRunAdmin(admin.ModelAdmin):
+    list_display = ('name', 'last_run_at')
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('task', 'attempts', 'created_at')
+    search_fields = ('task', 'last_error')
@@ -0,0 +1,28 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from notifications.utils import relay_outbox
+
+
+class Command(BaseCommand):
+    help = 'Publish committed outbox rows to the task queue in batches (use --loop to run as the relay process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=settings.OUTBOX_RELAY_INTERVAL,
+                            help='Seconds to wait when the outbox is empty (with --loop)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep relaying instead of exiting when the outbox is empty')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            published = relay_outbox(batch_size)
+            if published:
+                self.stdout.write(f'Published {published} outbox messages')
+            if published < batch_size:
+                if not options['loop']:
+                    return
+                close_old_connections()
+                time.sleep(options['interval'])
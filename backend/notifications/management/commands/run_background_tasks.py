@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from intern_management.task_backend import run_due_tasks
+
+
+class Command(BaseCommand):
+    help = 'Run due tasks from the in-process backend retry queue (for cron or after a restart)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Maximum tasks to run')
+
+    def handle(self, *args, **options):
+        ran = run_due_tasks(limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Ran {ran} background tasks'))
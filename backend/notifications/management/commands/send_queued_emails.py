@@ -0,0 +1,29 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from notifications.utils import flush_email_queue
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails in batches over a reused SMTP connection (use --loop to run as a worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_BATCH_SIZE,
+                            help='Emails sent per SMTP connection')
+        parser.add_argument('--interval', type=float, default=settings.EMAIL_FLUSH_INTERVAL,
+                            help='Seconds to wait when the queue is empty (with --loop)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep draining the queue instead of exiting when it is empty')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        while True:
+            sent = flush_email_queue(batch_size)
+            if sent:
+                self.stdout.write(f'Sent {sent} emails')
+            if sent < batch_size:
+                if not options['loop']:
+                    return
+                close_old_connections()
+                time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-17 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notification_notification_unread'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, help_text='Set while a sender holds the row; expires if it dies', null=True),
+        ),
+    ]
@@ -23,6 +23,92 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination (intern_management.pagination) of a user's notifications
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notification_keyset'),
+            # Unread counts and mark_all_read; only unread rows are indexed
+            models.Index(fields=['recipient', '-created_at'], name='notification_unread',
+                         condition=models.Q(is_read=False)),
+        ]
 
     def __str__(self):
-        return f"{self.title} -> {self.recipient.email}"
\ No newline at end of file
+        return f"{self.title} -> {self.recipient.email}"
+
+class QueuedEmail(models.Model):
+    """Outgoing email waiting for the batching sender (see notifications.utils.flush_email_queue)."""
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text='Comma-separated recipient addresses')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_until = models.DateTimeField(null=True, blank=True,
+                                         help_text='Set while a sender holds the row; expires if it dies')
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['sent_at', 'created_at'], name='queuedemail_pending')]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
+
+
+class BackgroundTask(models.Model):
+    """Persistent record of a task run by the in-process backend (intern_management.task_backend)."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255, help_text='Dotted path of the task function')
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after']
+        indexes = [models.Index(fields=['status', 'run_after'], name='backgroundtask_due')]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class PeriodicTaskRun(models.Model):
+    """When a CELERY_BEAT_SCHEDULE entry last ran under the in-process backend.
+
+    Every process runs a scheduler; the conditional UPDATE on this row lets
+    exactly one of them start each run (intern_management.task_backend).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_run_at}"
+
+
+class OutboxMessage(models.Model):
+    """Background task recorded in the same transaction as the change that triggers it.
+
+    The relay (notifications.utils.relay_outbox) publishes rows to the task
+    backend in batches once they are committed, then deletes them.
+    """
+    task = models.CharField(max_length=255, help_text='Dotted path of the task function')
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.task} {self.args}"
@@ -1,4 +1,109 @@
-from .models import Notification
+import logging
+from datetime import timedelta
+from importlib import import_module
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Notification, OutboxMessage, QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+UNREAD_CACHE_PREFIX = 'notifications:unread:'
+
+
+def _unread_cache_key(user_id):
+    return f'{UNREAD_CACHE_PREFIX}{user_id}'
+
+
+def get_unread_count(user_id):
+    """Unread notification count, served from the cache and counted on a miss.
+
+    The counter is adjusted in place on writes, which other workers only see
+    through a shared cache; without one the count is taken every time.
+    """
+    if not settings.CACHE_SHARED:
+        return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+    key = _unread_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+        cache.set(key, count, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    """Shift a cached unread count; a missing key is left for the next read to count."""
+    if not delta or not settings.CACHE_SHARED:
+        return
+    try:
+        cache.incr(_unread_cache_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def adjust_unread_counts(user_ids, delta):
+    for user_id in user_ids:
+        adjust_unread_count(user_id, delta)
+
+
+def reset_unread_count(user_id, count=None):
+    """Store a known count, or drop the cached one so it is recounted."""
+    if count is None or not settings.CACHE_SHARED:
+        cache.delete(_unread_cache_key(user_id))
+    else:
+        cache.set(_unread_cache_key(user_id), count, settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+
+
+def defer_task(task, *args, **kwargs):
+    """Record a background task in the outbox, inside the caller's transaction.
+
+    `task` is a task function or its dotted path. Nothing reaches the broker
+    until the row is committed, so a rolled-back request never fires its side
+    effects. The row is relayed right after the commit; the scheduled
+    relay_outbox task retries whatever that misses.
+    """
+    if callable(task):
+        task = f'{task.__module__}.{task.__name__}'
+    message = OutboxMessage.objects.create(task=task, args=list(args), kwargs=kwargs)
+    transaction.on_commit(lambda: _relay_committed(message.pk))
+    return message
+
+
+def _relay_committed(message_id):
+    # Runs after the caller's commit; a failure here must not fail the request
+    try:
+        relay_outbox(message_ids=[message_id])
+    except Exception:
+        logger.exception('Outbox message %s could not be relayed', message_id)
+
+
+def relay_outbox(batch_size=None, message_ids=None):
+    """Publish up to batch_size committed outbox rows (optionally only message_ids); return how many."""
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    messages = OutboxMessage.objects.select_for_update(skip_locked=True).filter(
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    )
+    if message_ids is not None:
+        messages = messages.filter(pk__in=message_ids)
+    with transaction.atomic():
+        batch = list(messages[:batch_size])
+        published, failed = [], []
+        for message in batch:
+            try:
+                module_name, func_name = message.task.rsplit('.', 1)
+                getattr(import_module(module_name), func_name).delay(*message.args, **message.kwargs)
+                published.append(message.pk)
+            except Exception as exc:
+                message.attempts += 1
+                message.last_error = repr(exc)
+                failed.append(message)
+        OutboxMessage.objects.filter(pk__in=published).delete()
+        if failed:
+            OutboxMessage.objects.bulk_update(failed, ['attempts', 'last_error'])
+    return len(published)
 
 
 def send_notification(recipient, title, message, notification_type='reminder',
@@ -12,12 +117,102 @@ def send_notification(recipient, title, message, notification_type='reminder',
         related_object_id=related_object_id,
         related_object_type=related_object_type,
     )
+    # Only count it once the row is visible to other requests
+    transaction.on_commit(lambda: adjust_unread_count(recipient.id, 1))
+    defer_task('notifications.tasks.send_notification_email', notification.id)
+    return notification
+
+
+def send_bulk_notification(recipients, title, message, notification_type='reminder',
+                           related_object_id=None, related_object_type=''):
+    """Notify many recipients with one INSERT and a single batched email task."""
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient=recipient,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            related_object_id=related_object_id,
+            related_object_type=related_object_type,
+        )
+        for recipient in recipients
+    ])
+    if not notifications:
+        return notifications
+    recipient_ids = [notification.recipient_id for notification in notifications]
+    transaction.on_commit(lambda: adjust_unread_counts(recipient_ids, 1))
+    defer_task('notifications.tasks.send_bulk_notification_email',
+               [notification.id for notification in notifications])
+    return notifications
+
+
+def queue_email(subject, message, recipient_list, from_email=None):
+    """Queue an email for the batching sender instead of opening an SMTP connection now."""
+    return queue_emails([(subject, message, recipient_list)], from_email=from_email)
 
-    # Dispatch email via Celery if available
+
+def queue_emails(messages, from_email=None):
+    """Queue many (subject, message, recipient_list) emails with one INSERT."""
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    return QueuedEmail.objects.bulk_create([
+        QueuedEmail(subject=subject, body=message, from_email=from_email,
+                    to=','.join(recipient_list))
+        for subject, message, recipient_list in messages
+        if any(recipient_list)
+    ])
+
+
+def flush_email_queue(batch_size=None):
+    """Send up to batch_size queued emails over one SMTP connection; return how many were sent.
+
+    Rows are claimed in a short transaction (SKIP LOCKED, then claimed_until)
+    and sent after it commits, so no locks are held during SMTP. Each claim
+    counts as an attempt, including a batch whose connection fails to open, so
+    rows stop being retried after EMAIL_MAX_ATTEMPTS. Each message is sent
+    individually on the shared connection, so one bad address only fails its row.
+    """
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(QueuedEmail.objects.select_for_update(skip_locked=True).filter(
+            Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+            sent_at__isnull=True, attempts__lt=settings.EMAIL_MAX_ATTEMPTS,
+        )[:batch_size])
+        if not batch:
+            return 0
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            claimed_until=now + timedelta(seconds=settings.EMAIL_CLAIM_TIMEOUT),
+            attempts=F('attempts') + 1,
+        )
+
+    connection = get_connection()
     try:
-        from .tasks import send_notification_email
-        send_notification_email.delay(notification.id)
-    except Exception:
-        pass  # Celery not available; notification still created
+        connection.open()
+    except Exception as exc:
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            claimed_until=None, last_error=str(exc),
+        )
+        return 0
+
+    sent = 0
+    try:
+        for email in batch:
+            message = EmailMessage(email.subject, email.body, email.from_email, email.to.split(','))
+            try:
+                connection.send_messages([message])
+                email.sent_at = timezone.now()
+                sent += 1
+            except Exception as exc:
+                email.last_error = str(exc)
+            email.claimed_until = None
+    finally:
+        connection.close()
+        QueuedEmail.objects.bulk_update(batch, ['sent_at', 'claimed_until', 'last_error'])
+    return sent
+
 
-    return notification
\ No newline at end of file
+def purge_sent_emails():
+    """Delete queued emails sent more than EMAIL_SENT_RETENTION_DAYS ago; return how many."""
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_SENT_RETENTION_DAYS)
+    deleted, _ = QueuedEmail.objects.filter(sent_at__lt=cutoff).delete()
+    return deleted
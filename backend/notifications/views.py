@@ -1,12 +1,18 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from django.conf import settings
+from intern_management.pagination import SelectablePagination
+from intern_management.streaming import EventStreamRenderer, event_stream, sse_response, streams_unavailable
 from .models import Notification
 from .serializers import NotificationSerializer, NotificationUpdateSerializer
+from .utils import get_unread_count, adjust_unread_count, reset_unread_count
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
 
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
@@ -16,19 +22,50 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return NotificationUpdateSerializer
         return NotificationSerializer
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        reset_unread_count(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        if not instance.is_read:
+            adjust_unread_count(self.request.user.id, -1)
+
     @action(detail=False, methods=['post'])
     def mark_read(self, request):
         notification_ids = request.data.get('ids', [])
         if notification_ids:
-            Notification.objects.filter(id__in=notification_ids, recipient=request.user).update(is_read=True)
+            updated = Notification.objects.filter(
+                id__in=notification_ids, recipient=request.user, is_read=False
+            ).update(is_read=True)
+            adjust_unread_count(request.user.id, -updated)
         return Response({'message': 'Notifications marked as read'})
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+        reset_unread_count(request.user.id, 0)
         return Response({'message': 'All notifications marked as read'})
 
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        count = Notification.objects.filter(recipient=request.user, is_read=False).count()
-        return Response({'count': count})
\ No newline at end of file
+        return Response({'count': get_unread_count(request.user.id)})
+
+    @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer, EventStreamRenderer])
+    def unread_stream(self, request):
+        """Server-sent 'unread' events carrying the count, sent on connect and on change.
+
+        Answers 503 unless STREAMING_ENABLED; the bell then polls unread_count."""
+        if not settings.STREAMING_ENABLED:
+            return streams_unavailable()
+        user_id = request.user.id
+        last = {'count': None}
+
+        def poll():
+            count = get_unread_count(user_id)
+            if count == last['count']:
+                return []
+            last['count'] = count
+            return [('unread', {'count': count})]
+
+        return sse_response(event_stream(poll))
\ No newline at end of file
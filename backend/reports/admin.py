@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import DailyMetric, MetricCheckpoint, StaleDailyMetric
+
+
+@admin.register(DailyMetric)
+class DailyMetricAdmin(admin.ModelAdmin):
+    list_display = ('intern', 'date', 'program', 'attendance_status', 'on_leave', 'tasks_completed', 'reviews_submitted')
+    list_filter = ('attendance_status', 'on_leave', 'program')
+    search_fields = ('intern__email',)
+    date_hierarchy = 'date'
+    raw_id_fields = ('intern',)
+
+
+@admin.register(MetricCheckpoint)
+class MetricCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('name', 'last_run_at')
+
+
+@admin.register(StaleDailyMetric)
+class StaleDailyMetricAdmin(admin.ModelAdmin):
+    list_display = ('intern', 'date', 'created_at')
+    raw_id_fields = ('intern',)
@@ -0,0 +1,263 @@
+"""Helpers for the query-budget benchmark commands.
+
+Benchmarks run against a throwaway test database seeded with synthetic data,
+so they never touch the configured database's rows.
+"""
+import json
+import statistics
+import time
+from datetime import timedelta
+from contextlib import contextmanager
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import NoReverseMatch, URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+ROLES = ('admin', 'supervisor', 'intern')
+
+# Wall-time budgets: the recorded median times MS_HEADROOM, and at least
+# MS_MIN_SLACK above it, so scheduler noise on fast endpoints does not fail a run
+MS_HEADROOM = 3.0
+MS_MIN_SLACK = 50.0
+
+
+@contextmanager
+def benchmark_database(verbosity=0):
+    """Create a fresh test database for the duration of the block."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def seed_benchmark_data(interns=300, days=30, seed=1234):
+    """Seed the benchmark database via generate_load_data and return one user per role."""
+    from accounts.models import User
+
+    call_command('generate_load_data', scale=interns, days=days, seed=seed, stdout=StringIO())
+    return {
+        role: User.objects.filter(role=role).order_by('id').first()
+        for role in ROLES
+    }
+
+
+def _iter_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def discover_get_endpoints():
+    """Return (name, basename, needs_pk) for every named GET API route, list routes first."""
+    endpoints = {}
+    for pattern in _iter_patterns(get_resolver().url_patterns):
+        callback = pattern.callback
+        if not pattern.name or pattern.name == 'api-root':
+            continue
+        params = set(pattern.pattern.regex.groupindex)
+        if 'format' in params or params - {'pk'}:
+            continue
+        actions = getattr(callback, 'actions', None)
+        if actions is not None:
+            if 'get' not in actions:
+                continue
+            basename = callback.initkwargs.get('basename')
+        else:
+            view_class = getattr(callback, 'cls', None)
+            if view_class is None or not hasattr(view_class, 'get'):
+                continue
+            basename = None
+        try:
+            path = reverse(pattern.name, kwargs={'pk': 0} if 'pk' in params else None)
+        except NoReverseMatch:
+            continue
+        if not path.startswith('/api/'):
+            continue
+        endpoints[pattern.name] = (pattern.name, basename, 'pk' in params)
+    return sorted(endpoints.values(), key=lambda e: (e[2], e[0]))
+
+
+def _first_id(data):
+    if isinstance(data, dict):
+        data = data.get('results', [])
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        return data[0].get('id')
+    return None
+
+
+def _timed_get(client, path):
+    """GET path on a cold cache; return (response, query count, wall time in ms)."""
+    cache.clear()
+    # The query log is a bounded deque; once full, a capture would count 0
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    return response, len(queries), elapsed_ms
+
+
+def measure_endpoints(users, repeat=5):
+    """Hit every GET endpoint `repeat` times per role, returning {'role:name': measurement}.
+
+    The cache is cleared before each request, so every endpoint is measured on
+    its cold path rather than on what an earlier endpoint (e.g. bootstrap) warmed.
+    Query count and size come from the first request, 'ms' is the median time.
+    """
+    results = {}
+    for role in ROLES:
+        user = users[role]
+        token, _ = Token.objects.get_or_create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        first_ids = {}
+
+        for name, basename, needs_pk in discover_get_endpoints():
+            if needs_pk:
+                pk = first_ids.get(basename)
+                if pk is None:
+                    continue
+                path = reverse(name, kwargs={'pk': pk})
+            else:
+                path = reverse(name)
+
+            response, query_count, elapsed_ms = _timed_get(client, path)
+            if response.streaming:
+                # Event streams never finish on their own; nothing to measure
+                response.close()
+                continue
+            timings = [elapsed_ms] + [_timed_get(client, path)[2] for _ in range(repeat - 1)]
+
+            if not needs_pk and basename and response.status_code == 200 and basename not in first_ids:
+                pk = _first_id(response.data)
+                if pk is not None:
+                    first_ids[basename] = pk
+
+            results[f'{role}:{name}'] = {
+                'path': path,
+                'status': response.status_code,
+                'queries': query_count,
+                'ms': round(statistics.median(timings), 1),
+                'bytes': len(response.content),
+            }
+    return results
+
+
+def load_budgets(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def write_budgets(path, results):
+    """Store budgets from a run: exact query counts, 50% headroom on response size,
+    MS_HEADROOM on the median wall time."""
+    budgets = {
+        key: {
+            'queries': result['queries'],
+            'bytes': int(result['bytes'] * 1.5) + 256,
+            'ms': round(max(result['ms'] * MS_HEADROOM, result['ms'] + MS_MIN_SLACK), 1),
+        }
+        for key, result in sorted(results.items())
+    }
+    with open(path, 'w') as fh:
+        json.dump(budgets, fh, indent=2)
+        fh.write('\n')
+
+
+def check_budgets(results, budgets):
+    """Return a list of human-readable budget violations."""
+    violations = []
+    for key, result in sorted(results.items()):
+        budget = budgets.get(key)
+        if budget is None:
+            violations.append(f'{key}: no stored budget')
+            continue
+        for metric in ('queries', 'bytes', 'ms'):
+            limit = budget.get(metric)
+            if limit is not None and result[metric] > limit:
+                violations.append(f'{key}: {metric} {result[metric]} > budget {limit}')
+    return violations
+
+
+def hot_queries(users):
+    """(label, queryset, index it must use) for the hot filter paths; None accepts any index.
+
+    The hot paths are counts and updates, which drop the default ordering, so
+    the querysets here are unordered too.
+    """
+    from applications.models import Application
+    from attendance.models import AttendanceRecord
+    from leave.models import LeaveRequest
+    from leave.utils import overlapping
+    from notifications.models import Notification
+    from tasks.models import Task
+
+    intern = users['intern']
+    today = timezone.localdate()
+    queries = [
+        ('unread notifications',
+         Notification.objects.filter(recipient=intern, is_read=False), 'notification_unread'),
+        ('attendance by day and status',
+         AttendanceRecord.objects.filter(date=today, status='present'), 'attendance_date_status'),
+        ('attendance for a user and day',
+         AttendanceRecord.objects.filter(user=intern, date=today), None),
+        ('intern tasks by status',
+         Task.objects.filter(assigned_to=intern, status__in=['todo', 'in_progress']), 'task_assignee_status_due'),
+        ('open tasks past due',
+         Task.objects.filter(due_date__lt=today, status__in=['todo', 'in_progress']), 'task_status_due'),
+        ('approved leave in a year',
+         LeaveRequest.objects.filter(applicant=intern, status__in=['approved', 'supervisor_approved'],
+                                     start_date__year=today.year), 'leave_applicant_status_start'),
+        ('applications by status',
+         Application.objects.filter(status='pending'), 'application_status_program'),
+    ]
+    if connection.vendor == 'postgresql':
+        # The range overlap only has an index (GiST on daterange) on PostgreSQL
+        queries.append(('leave overlapping a window',
+                        overlapping(LeaveRequest.objects.all(), today, today + timedelta(days=13)),
+                        'leave_period_gist'))
+    return queries
+
+
+def _plan_uses_index(plan, index_name):
+    if index_name is not None:
+        return index_name in plan
+    # PostgreSQL: "Index Scan", "Index Only Scan", "Bitmap Index Scan"; SQLite: "USING [COVERING] INDEX"
+    return 'Index' in plan or 'INDEX' in plan
+
+
+def explain_hot_queries(users):
+    """EXPLAIN each hot query and report whether the planner picks its index.
+
+    On PostgreSQL sequential scans are disabled for the check, since on a small
+    benchmark dataset the planner may rightly prefer them; what is verified is
+    that the index matches the query shape.
+    """
+    results = []
+    for label, queryset, index_name in hot_queries(users):
+        queryset = queryset.order_by()
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        results.append({
+            'label': label,
+            'index': index_name or 'any index',
+            'used': _plan_uses_index(plan, index_name),
+            'plan': plan,
+        })
+    return results
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from reports.benchmark import (
+    benchmark_database, seed_benchmark_data, measure_endpoints,
+    load_budgets, write_budgets, check_budgets, explain_hot_queries,
+)
+
+DEFAULT_BUDGETS = Path(__file__).resolve().parents[2] / 'query_budgets.json'
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database, hit every GET API endpoint as each role, '
+            'and fail if query count, response size or wall time exceed stored budgets '
+            'or a hot query stops using its index')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interns', type=int, default=300, help='Number of interns to seed')
+        parser.add_argument('--days', type=int, default=30, help='Days of attendance history to seed')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Requests per endpoint; wall time is the median')
+        parser.add_argument('--budgets', default=str(DEFAULT_BUDGETS), help='Path to the budgets JSON file')
+        parser.add_argument('--update-budgets', action='store_true',
+                            help='Record this run as the new budgets instead of checking')
+        parser.add_argument('--output', help='Write the raw measurements to this JSON file')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            users = seed_benchmark_data(interns=options['interns'], days=options['days'])
+            results = measure_endpoints(users, repeat=max(options['repeat'], 1))
+            plans = explain_hot_queries(users)
+
+        for key, result in sorted(results.items()):
+            self.stdout.write(
+                f"{key:<55} {result['status']:>3} {result['queries']:>5}q "
+                f"{result['ms']:>8.1f}ms {result['bytes']:>9}B"
+            )
+
+        missing_indexes = []
+        for plan in plans:
+            state = 'ok' if plan['used'] else 'NOT USED'
+            self.stdout.write(f"explain {plan['label']:<47} {plan['index']:<30} {state}")
+            if not plan['used']:
+                missing_indexes.append(f"{plan['label']}: expected {plan['index']}, plan was: {plan['plan']}")
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+
+        if options['update_budgets']:
+            write_budgets(options['budgets'], results)
+            self.stdout.write(self.style.SUCCESS(f"Budgets written to {options['budgets']}"))
+            violations = missing_indexes
+        else:
+            violations = check_budgets(results, load_budgets(options['budgets'])) + missing_indexes
+        if violations:
+            for violation in violations:
+                self.stdout.write(self.style.ERROR(violation))
+            raise CommandError(f'{len(violations)} budget violation(s)')
+        if options['update_budgets']:
+            return
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} endpoint measurements within budget'))
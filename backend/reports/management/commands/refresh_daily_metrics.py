@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from reports.metrics import refresh_daily_metrics
+
+
+class Command(BaseCommand):
+    help = 'Refresh the DailyMetric rollup table (incremental by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Drop and rebuild every DailyMetric row from source tables',
+        )
+
+    def handle(self, *args, **options):
+        written = refresh_daily_metrics(full=options['full'])
+        mode = 'Full rebuild' if options['full'] else 'Incremental refresh'
+        self.stdout.write(self.style.SUCCESS(f'{mode} complete: {written} daily metric rows written'))
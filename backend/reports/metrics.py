@@ -0,0 +1,198 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from accounts.models import User
+from applications.models import Application
+from attendance.models import AttendanceRecord
+from leave.models import LeaveRequest
+from reviews.models import Review
+from tasks.models import Task
+from .models import DailyMetric, MetricCheckpoint, StaleDailyMetric
+
+CHECKPOINT_NAME = 'daily_metrics'
+USER_BATCH_SIZE = 500
+WRITE_BATCH_SIZE = 1000
+
+# Source fields that decide which (intern, date) rollup rows a row feeds
+TRACKED_FIELDS = {
+    AttendanceRecord: ('user_id', 'date'),
+    Task: ('assigned_to_id', 'due_date', 'completed_at'),
+    LeaveRequest: ('applicant_id', 'start_date', 'end_date'),
+    Review: ('intern_id', 'submitted_at'),
+}
+
+
+def _local_date(value):
+    return timezone.localdate(value) if value else None
+
+
+def _date_span(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def metric_keys(model, values):
+    """Return the (intern id, date) keys fed by a source row with these TRACKED_FIELDS values."""
+    if model is AttendanceRecord:
+        user_id, day = values
+        days = {day}
+    elif model is Task:
+        user_id, due_date, completed_at = values
+        days = {due_date, _local_date(completed_at)}
+    elif model is LeaveRequest:
+        user_id, start_date, end_date = values
+        days = set(_date_span(start_date, end_date)) if start_date and end_date else set()
+    else:
+        user_id, submitted_at = values
+        days = {_local_date(submitted_at)}
+    if user_id is None:
+        return set()
+    return {(user_id, day) for day in days if day}
+
+
+def collect_touched(since=None, stale=()):
+    """Map intern id -> set of dates whose source rows changed since the watermark.
+
+    With since=None every source row is considered (full rebuild). `stale`
+    adds StaleDailyMetric rows: keys that rows changed or deleted since then
+    no longer feed.
+    """
+    touched = defaultdict(set)
+
+    for model, fields in TRACKED_FIELDS.items():
+        rows = model.objects.all()
+        if model is Review:
+            rows = rows.filter(submitted_at__isnull=False)
+        if since:
+            rows = rows.filter(updated_at__gte=since)
+        for values in rows.values_list(*fields):
+            for user_id, day in metric_keys(model, values):
+                touched[user_id].add(day)
+
+    for row in stale:
+        touched[row.intern_id].add(row.date)
+
+    return touched
+
+
+def rebuild_metrics(touched):
+    """Recompute DailyMetric rows for the given {intern_id: dates} with grouped queries."""
+    intern_ids = set(User.objects.filter(
+        id__in=list(touched), role='intern'
+    ).values_list('id', flat=True))
+
+    program_by_intern = dict(
+        Application.objects.filter(applicant_id__in=intern_ids, status='approved')
+        .order_by('submitted_at')
+        .values_list('applicant_id', 'program_id')
+    )
+
+    written = 0
+    batch_ids = sorted(intern_ids)
+    for offset in range(0, len(batch_ids), USER_BATCH_SIZE):
+        user_ids = batch_ids[offset:offset + USER_BATCH_SIZE]
+        days = set().union(*(touched[uid] for uid in user_ids))
+        lo, hi = min(days), max(days)
+
+        attendance = {
+            (row['user_id'], row['date']): row
+            for row in AttendanceRecord.objects.filter(
+                user_id__in=user_ids, date__range=[lo, hi]
+            ).values('user_id', 'date', 'status', 'check_in', 'check_out')
+        }
+        tasks_due = {
+            (row['assigned_to_id'], row['due_date']): row['n']
+            for row in Task.objects.filter(
+                assigned_to_id__in=user_ids, due_date__range=[lo, hi]
+            ).values('assigned_to_id', 'due_date').annotate(n=Count('id'))
+        }
+        tasks_completed = {
+            (row['assigned_to_id'], row['day']): row['n']
+            for row in Task.objects.filter(
+                assigned_to_id__in=user_ids, completed_at__isnull=False
+            ).annotate(day=TruncDate('completed_at')).filter(
+                day__range=[lo, hi]
+            ).values('assigned_to_id', 'day').annotate(n=Count('id'))
+        }
+        reviews = {
+            (row['intern_id'], row['day']): row
+            for row in Review.objects.filter(
+                intern_id__in=user_ids, status__in=['submitted', 'acknowledged'],
+                submitted_at__isnull=False,
+            ).annotate(day=TruncDate('submitted_at')).filter(
+                day__range=[lo, hi]
+            ).values('intern_id', 'day').annotate(n=Count('id'), total=Sum('overall_rating'))
+        }
+        on_leave = set()
+        for user_id, start_date, end_date in LeaveRequest.objects.filter(
+            applicant_id__in=user_ids, status='approved',
+            start_date__lte=hi, end_date__gte=lo,
+        ).values_list('applicant_id', 'start_date', 'end_date'):
+            on_leave.update((user_id, day) for day in _date_span(max(start_date, lo), min(end_date, hi)))
+
+        rows = []
+        for user_id in user_ids:
+            for day in touched[user_id]:
+                key = (user_id, day)
+                record = attendance.get(key)
+                review = reviews.get(key)
+                rows.append(DailyMetric(
+                    intern_id=user_id,
+                    date=day,
+                    program_id=program_by_intern.get(user_id),
+                    attendance_status=record['status'] if record else '',
+                    checked_in=bool(record and record['check_in']),
+                    checked_out=bool(record and record['check_out']),
+                    on_leave=key in on_leave,
+                    tasks_due=tasks_due.get(key, 0),
+                    tasks_completed=tasks_completed.get(key, 0),
+                    reviews_submitted=review['n'] if review else 0,
+                    rating_total=review['total'] if review else 0,
+                ))
+
+        DailyMetric.objects.bulk_create(
+            rows, batch_size=WRITE_BATCH_SIZE,
+            update_conflicts=True, unique_fields=['intern', 'date'],
+            update_fields=['program', 'attendance_status', 'checked_in', 'checked_out',
+                           'on_leave', 'tasks_due', 'tasks_completed',
+                           'reviews_submitted', 'rating_total', 'updated_at'],
+        )
+        written += len(rows)
+
+    return written
+
+
+def refresh_daily_metrics(full=False):
+    """Incrementally refresh DailyMetric rows touched since the last run.
+
+    The new watermark is taken before reading, and each run re-reads
+    DAILY_METRICS_WATERMARK_MARGIN seconds before the previous one, so writes
+    that committed after a run with an earlier updated_at are picked up again.
+    Keys that saves and deletes moved rows away from come from StaleDailyMetric
+    (see reports.signals); bulk QuerySet updates bypass those and are only
+    reflected by a full rebuild. The run is one transaction, so readers keep
+    seeing the previous rows until a rebuild has fully succeeded.
+    """
+    started_at = timezone.now()
+    with transaction.atomic():
+        checkpoint, _ = MetricCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+        since = None
+        if not full and checkpoint.last_run_at:
+            since = checkpoint.last_run_at - timedelta(seconds=settings.DAILY_METRICS_WATERMARK_MARGIN)
+
+        # Rows recorded after this read stay for the next run
+        stale = list(StaleDailyMetric.objects.all())
+
+        if full:
+            DailyMetric.objects.all().delete()
+
+        # Without a watermark every source row is read, which covers the stale keys
+        written = rebuild_metrics(collect_touched(since, stale if since else ()))
+        StaleDailyMetric.objects.filter(pk__in=[row.pk for row in stale]).delete()
+
+        checkpoint.last_run_at = started_at
+        checkpoint.save(update_fields=['last_run_at'])
+    return written
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-17 20:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reports', '0002_staledailymetric'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='staledailymetric',
+            name='intern',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
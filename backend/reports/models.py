@@ -0,0 +1,61 @@
+from django.db import models
+from django.conf import settings
+
+
+class DailyMetric(models.Model):
+    """Per-intern daily rollup of attendance, task, leave and review activity.
+
+    One row per (date, intern); program is the intern's approved program, so
+    each row is also unique per (date, program, intern). Filled incrementally
+    by reports.metrics.refresh_daily_metrics.
+    """
+    date = models.DateField()
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_metrics')
+    program = models.ForeignKey('applications.Program', on_delete=models.SET_NULL, null=True, blank=True, related_name='daily_metrics')
+    attendance_status = models.CharField(max_length=10, blank=True)
+    checked_in = models.BooleanField(default=False)
+    checked_out = models.BooleanField(default=False)
+    on_leave = models.BooleanField(default=False)
+    tasks_due = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0)
+    reviews_submitted = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['intern', 'date']
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'program'], name='dailymetric_date_program'),
+        ]
+
+    def __str__(self):
+        return f"{self.intern_id} - {self.date}"
+
+
+class MetricCheckpoint(models.Model):
+    """Watermark of the last successful incremental rollup run."""
+    name = models.CharField(max_length=50, unique=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_run_at}"
+
+
+class StaleDailyMetric(models.Model):
+    """An (intern, date) rollup key a source row stopped feeding.
+
+    Written when a save moves a row to another intern or date, or a delete
+    removes it, since the old key can no longer be found from updated_at.
+    The next incremental refresh rebuilds and removes these rows.
+
+    Deleting a user deletes its source rows after this table's cascade has
+    run, so the reference is unconstrained; the refresh skips missing interns.
+    """
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING,
+                               db_constraint=False, related_name='+')
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.intern_id} - {self.date}"
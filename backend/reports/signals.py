@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from attendance.models import AttendanceRecord
+from leave.models import LeaveRequest
+from reviews.models import Review
+from tasks.models import Task
+from .metrics import TRACKED_FIELDS, metric_keys
+from .models import StaleDailyMetric
+from .utils import invalidate_dashboards
+
+
+def _invalidate_on_commit(intern_ids=(), supervisor_ids=()):
+    # After commit, so a concurrent read cannot re-cache the old numbers
+    transaction.on_commit(lambda: invalidate_dashboards(intern_ids, supervisor_ids))
+
+
+def _tracked_values(instance):
+    # From __dict__, so a deferred field is not loaded (it counts as unknown)
+    return tuple(instance.__dict__.get(field) for field in TRACKED_FIELDS[type(instance)])
+
+
+def metrics_loaded(sender, instance, **kwargs):
+    instance._loaded_metric_values = _tracked_values(instance)
+
+
+def metrics_changed(sender, instance, **kwargs):
+    # Keys the row no longer feeds cannot be found from updated_at by the
+    # incremental DailyMetric refresh, so record them in the same transaction
+    current = _tracked_values(instance)
+    stale = metric_keys(sender, instance._loaded_metric_values)
+    if kwargs.get('signal') is post_delete:
+        stale |= metric_keys(sender, current)
+    else:
+        stale -= metric_keys(sender, current)
+    instance._loaded_metric_values = current
+    if stale:
+        StaleDailyMetric.objects.bulk_create(
+            [StaleDailyMetric(intern_id=user_id, date=day) for user_id, day in stale]
+        )
+
+
+for model in TRACKED_FIELDS:
+    post_init.connect(metrics_loaded, sender=model, dispatch_uid=f'metrics_loaded:{model.__name__}')
+    post_save.connect(metrics_changed, sender=model, dispatch_uid=f'metrics_saved:{model.__name__}')
+    post_delete.connect(metrics_changed, sender=model, dispatch_uid=f'metrics_deleted:{model.__name__}')
+
+
+@receiver(post_init, sender=Task)
+def task_loaded(sender, instance, **kwargs):
+    # Remember the assignee as loaded (without touching a deferred field), so a
+    # reassignment also refreshes the previous assignee's dashboard
+    instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id')
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    intern_ids = {instance.assigned_to_id, instance._loaded_assigned_to_id} - {None}
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+    _invalidate_on_commit(intern_ids)
+
+
+@receiver(post_save, sender=AttendanceRecord)
+@receiver(post_delete, sender=AttendanceRecord)
+def attendance_changed(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+def leave_request_changed(sender, instance, **kwargs):
+    # Leave balances on the intern dashboard come from the ledger written alongside
+    _invalidate_on_commit([instance.applicant_id])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.intern_id], [instance.reviewer_id])
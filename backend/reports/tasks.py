@@ -0,0 +1,27 @@
+from datetime import date
+from django.core.cache import cache
+from intern_management.task_backend import task
+
+
+@task
+def refresh_admin_report(start_date=None, end_date=None, year=None):
+    """Rebuild the cached admin report snapshot (defaults to the dashboard's window)."""
+    from .utils import default_report_range, admin_report_cache_key
+    from .utils import refresh_admin_report as rebuild
+
+    default_start, default_end, default_year = default_report_range()
+    start_date = date.fromisoformat(start_date) if start_date else default_start
+    end_date = date.fromisoformat(end_date) if end_date else default_end
+    year = int(year) if year else default_year
+
+    try:
+        rebuild(start_date, end_date, year)
+    finally:
+        cache.delete(f'{admin_report_cache_key(start_date, end_date, year)}:refreshing')
+
+
+@task
+def refresh_daily_metrics(full=False):
+    """Roll touched attendance/task/leave/review rows into DailyMetric."""
+    from .metrics import refresh_daily_metrics as refresh
+    return refresh(full=full)
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import intern_dashboard, supervisor_dashboard, admin_reports
+from .views import intern_dashboard, supervisor_dashboard, admin_reports, bootstrap
 
 urlpatterns = [
     path('dashboard/intern/', intern_dashboard, name='intern_dashboard'),
     path('dashboard/supervisor/', supervisor_dashboard, name='supervisor_dashboard'),
     path('reports/', admin_reports, name='admin_reports'),
+    path('bootstrap/', bootstrap, name='bootstrap'),
 ]
\ No newline at end of file
@@ -0,0 +1,227 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from applications.models import Application
+from attendance.models import AttendanceRecord
+from reviews.models import Review
+from leave.models import LeaveRequest
+from tasks.models import Task
+from .models import DailyMetric
+
+DASHBOARD_CACHE_PREFIX = 'reports:dashboard:'
+
+
+def default_report_range():
+    """Default admin report window: attendance over the last 30 days, leave for this year."""
+    today = timezone.now().date()
+    return today - timedelta(days=30), today, today.year
+
+
+def admin_report_cache_key(start_date, end_date, year):
+    return f'reports:admin:{start_date.isoformat()}:{end_date.isoformat()}:{year}'
+
+
+def daily_trend_aggregates():
+    """Per-day aggregates over DailyMetric rows, for use with .values('date').annotate()."""
+    return {
+        'records': Count('id', filter=~Q(attendance_status='')),
+        'present': Count('id', filter=Q(attendance_status='present')),
+        'absent': Count('id', filter=Q(attendance_status='absent')),
+        'late': Count('id', filter=Q(attendance_status='late')),
+        'on_leave': Count('id', filter=Q(on_leave=True)),
+        'tasks_completed': Sum('tasks_completed'),
+    }
+
+
+def build_admin_report(start_date, end_date, year):
+    """Compute admin report statistics with one conditional-aggregate query per model.
+
+    Attendance (the per-day trend and its totals) is read from the DailyMetric
+    rollup, one row per day, rather than from raw attendance rows.
+    """
+    app_stats = Application.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        under_review=Count('id', filter=Q(status='under_review')),
+        approved=Count('id', filter=Q(status='approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+    )
+
+    ratings = Review.objects.filter(
+        status__in=['submitted', 'acknowledged']
+    ).aggregate(**{
+        str(rating): Count('id', filter=Q(overall_rating=rating))
+        for rating in range(1, 6)
+    })
+
+    leave_stats = LeaveRequest.objects.filter(start_date__year=year).aggregate(
+        total_requests=Count('id'),
+        approved=Count('id', filter=Q(status='approved')),
+        supervisor_approved=Count('id', filter=Q(status='supervisor_approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+        pending=Count('id', filter=Q(status='pending')),
+    )
+
+    daily_trend = list(DailyMetric.objects.filter(
+        date__range=[start_date, end_date]
+    ).values('date').annotate(**daily_trend_aggregates()).order_by('date'))
+    for row in daily_trend:
+        row['date'] = row['date'].isoformat()
+    attendance_stats = {
+        'total_records': sum(row['records'] for row in daily_trend),
+        'present': sum(row['present'] for row in daily_trend),
+        'absent': sum(row['absent'] for row in daily_trend),
+        'late': sum(row['late'] for row in daily_trend),
+    }
+
+    return {
+        'application_stats': app_stats,
+        'attendance_stats': attendance_stats,
+        'performance_distribution': ratings,
+        'leave_stats': leave_stats,
+        'daily_trend': daily_trend,
+    }
+
+
+def refresh_admin_report(start_date, end_date, year):
+    """Rebuild the cached admin report snapshot for a date range and return its data."""
+    data = build_admin_report(start_date, end_date, year)
+    data['generated_at'] = timezone.now().isoformat()
+    cache.set(
+        admin_report_cache_key(start_date, end_date, year),
+        {'data': data, 'generated_at': time.time()},
+        settings.ADMIN_REPORTS_CACHE_TIMEOUT,
+    )
+    return data
+
+
+def get_admin_report(start_date, end_date, year):
+    """Return the admin report snapshot, scheduling a background refresh once it is stale.
+
+    A cache miss is computed inline; a stale hit is served as-is while a
+    Celery task rebuilds it, so only one request per window ever scans the tables.
+    """
+    key = admin_report_cache_key(start_date, end_date, year)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        return refresh_admin_report(start_date, end_date, year)
+
+    if time.time() - snapshot['generated_at'] > settings.ADMIN_REPORTS_STALE_AFTER:
+        # Only one refresh in flight per key
+        if cache.add(f'{key}:refreshing', True, settings.ADMIN_REPORTS_STALE_AFTER):
+            try:
+                from .tasks import refresh_admin_report as refresh_task
+                refresh_task.delay(start_date.isoformat(), end_date.isoformat(), year)
+            except Exception:
+                pass  # Celery not available; snapshot expires on its own
+
+    return snapshot['data']
+
+
+# ── Dashboards ───────────────────────────────────────────────────
+# Both dashboards load on every login, so each is a handful of conditional
+# aggregates cached per user for DASHBOARD_CACHE_TIMEOUT seconds. Writes to
+# tasks, attendance, leave and reviews drop the affected entries (reports.signals).
+
+def _dashboard_cache_key(kind, user_id):
+    return f'{DASHBOARD_CACHE_PREFIX}{kind}:{user_id}'
+
+
+def build_intern_dashboard(user):
+    """Intern dashboard in three queries: counts, leave balances, recent activity."""
+    from leave.utils import leave_balance
+
+    today = timezone.now().date()
+
+    def count(queryset, owner):
+        # One correlated COUNT per relation, so tasks and reviews are never joined together
+        return Coalesce(Subquery(
+            queryset.filter(**{owner: OuterRef('pk')}).order_by().values(owner)
+            .annotate(n=Count('id')).values('n')[:1]
+        ), 0)
+
+    counts = get_user_model().objects.filter(pk=user.pk).annotate(
+        pending_tasks=count(Task.objects.filter(status__in=['todo', 'in_progress']), 'assigned_to'),
+        overdue_tasks=count(Task.objects.filter(status='overdue'), 'assigned_to'),
+        upcoming_reviews=count(Review.objects.filter(status='submitted'), 'intern'),
+        today_status=Subquery(AttendanceRecord.objects.filter(
+            user=OuterRef('pk'), date=today
+        ).values('status')[:1]),
+    ).values('pending_tasks', 'overdue_tasks', 'upcoming_reviews', 'today_status').get()
+
+    return {
+        'pending_tasks': counts['pending_tasks'],
+        'overdue_tasks': counts['overdue_tasks'],
+        'attendance_status': counts['today_status'] or 'not_checked_in',
+        'leave_balances': [
+            {'name': balance['leave_type_name'], 'remaining': balance['remaining_days']}
+            for balance in leave_balance(user, today.year)
+        ],
+        'upcoming_reviews': counts['upcoming_reviews'],
+        # Last 30 days of activity from the daily rollup
+        'recent_activity': list(DailyMetric.objects.filter(
+            intern=user, date__gte=today - timedelta(days=30)
+        ).order_by('date').values(
+            'date', 'attendance_status', 'on_leave', 'tasks_due', 'tasks_completed'
+        )),
+    }
+
+
+def build_supervisor_dashboard(user):
+    """Supervisor dashboard: one aggregate each for tasks, today's attendance, reviews and the trend."""
+    from accounts.utils import get_supervised_intern_ids
+
+    today = timezone.now().date()
+    intern_ids = get_supervised_intern_ids(user)
+    return {
+        'assigned_interns_count': len(intern_ids),
+        'pending_reviews': Review.objects.filter(reviewer=user, status='draft').count(),
+        'task_stats': Task.objects.filter(assigned_to_id__in=intern_ids).aggregate(**{
+            task_status: Count('id', filter=Q(status=task_status))
+            for task_status in ('todo', 'in_progress', 'completed', 'overdue')
+        }),
+        'attendance_summary': AttendanceRecord.objects.filter(
+            user_id__in=intern_ids, date=today
+        ).aggregate(**{
+            record_status: Count('id', filter=Q(status=record_status))
+            for record_status in ('present', 'absent', 'late')
+        }),
+        # Two-week attendance trend across assigned interns, from the daily rollup
+        'attendance_trend': list(DailyMetric.objects.filter(
+            intern_id__in=intern_ids, date__gte=today - timedelta(days=13)
+        ).values('date').annotate(**daily_trend_aggregates()).order_by('date')),
+    }
+
+
+def _cached_dashboard(kind, user, build):
+    key = _dashboard_cache_key(kind, user.pk)
+    data = cache.get(key)
+    if data is None:
+        data = build(user)
+        cache.set(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def get_intern_dashboard(user):
+    return _cached_dashboard('intern', user, build_intern_dashboard)
+
+
+def get_supervisor_dashboard(user):
+    return _cached_dashboard('supervisor', user, build_supervisor_dashboard)
+
+
+def invalidate_dashboards(intern_ids=(), supervisor_ids=()):
+    """Drop cached dashboards for interns, their assigned supervisors and any extra supervisors."""
+    from accounts.utils import get_intern_supervisor_ids
+
+    keys = {_dashboard_cache_key('supervisor', supervisor_id) for supervisor_id in supervisor_ids}
+    for intern_id in set(intern_ids):
+        keys.add(_dashboard_cache_key('intern', intern_id))
+        keys.update(_dashboard_cache_key('supervisor', supervisor_id)
+                    for supervisor_id in get_intern_supervisor_ids(intern_id))
+    cache.delete_many(list(keys))
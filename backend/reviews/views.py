@@ -1,12 +1,13 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
 from intern_management.permissions import IsAdminOrSupervisor
 from accounts.models import SupervisorAssignment
 from .models import Review
 from .serializers import ReviewSerializer, ReviewCreateSerializer, ReviewUpdateSerializer
-from notifications.utils import send_notification
+from notifications.utils import send_notification, defer_task
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -29,6 +30,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return ReviewSerializer
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def submit(self, request, pk=None):
         review = self.get_object()
         if review.reviewer != request.user and request.user.role != 'admin':
@@ -48,11 +50,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
             related_object_type='review',
         )
 
-        try:
-            from notifications.tasks import send_review_submission_email
-            send_review_submission_email.delay(review.id)
-        except Exception:
-            pass
+        defer_task('notifications.tasks.send_review_submission_email', review.id)
 
         serializer = ReviewSerializer(review)
         return Response(serializer.data)
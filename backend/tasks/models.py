@@ -30,6 +30,15 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Keyset pagination (intern_management.pagination): per intern and across all tasks
+        indexes = [
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='task_assignee_keyset'),
+            models.Index(fields=['-created_at', '-id'], name='task_keyset'),
+            # An intern's tasks by status (dashboards) and due date
+            models.Index(fields=['assigned_to', 'status', 'due_date'], name='task_assignee_status_due'),
+            # Open tasks past their due date (mark_overdue)
+            models.Index(fields=['status', 'due_date'], name='task_status_due'),
+        ]
 
     def __str__(self):
         return self.title
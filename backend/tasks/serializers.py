@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.utils import timezone
+from intern_management.serializers import SparseFieldsetMixin
 from .models import Task, TaskComment
 
 
@@ -12,7 +13,7 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'created_at']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     assigned_by_name = serializers.CharField(source='assigned_by.get_full_name', read_only=True)
     program_name = serializers.CharField(source='program.name', read_only=True)
@@ -27,6 +28,14 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'assigned_by', 'completed_at', 'created_at', 'updated_at']
 
 
+class TaskListSerializer(TaskSerializer):
+    """Task board rows: comment_count (annotated by the view) instead of nested comments."""
+    comment_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = [name for name in TaskSerializer.Meta.fields if name != 'comments'] + ['comment_count']
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
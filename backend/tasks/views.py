@@ -1,26 +1,47 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
 from django.utils import timezone
+from intern_management.pagination import SelectablePagination
 from intern_management.permissions import IsAdminOrSupervisor
-from accounts.models import SupervisorAssignment
+from intern_management.serializers import query_param_list
+from accounts.utils import get_supervised_intern_ids
 from .models import Task, TaskComment
-from .serializers import TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskCommentSerializer
-from notifications.utils import send_notification
+from .serializers import (
+    TaskSerializer, TaskListSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskCommentSerializer
+)
+from notifications.utils import send_notification, defer_task
+from reports.utils import invalidate_dashboards
 
 
 class TaskViewSet(viewsets.ModelViewSet):
+    """Tasks. The list is compact (comment_count, no comments) unless ?expand=comments;
+    ?fields=a,b limits list and detail output to the named fields."""
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SelectablePagination
 
     def get_queryset(self):
+        queryset = self.get_scoped_queryset()
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        queryset = queryset.select_related('assigned_to', 'assigned_by', 'program')
+        if self.expands_comments():
+            return queryset.prefetch_related(
+                Prefetch('comments', queryset=TaskComment.objects.select_related('author'))
+            )
+        return queryset.annotate(comment_count=Count('comments'))
+
+    def expands_comments(self):
+        return self.action == 'retrieve' or 'comments' in query_param_list(self.request, 'expand')
+
+    def get_scoped_queryset(self):
         user = self.request.user
         if user.role == 'admin':
             return Task.objects.all()
         if user.role == 'supervisor':
-            intern_ids = SupervisorAssignment.objects.filter(
-                supervisor=user
-            ).values_list('intern_id', flat=True)
+            intern_ids = get_supervised_intern_ids(user)
             # Use Q objects instead of QuerySet union (|) to preserve
             # filtering, ordering, and pagination capabilities.
             if intern_ids:
@@ -40,8 +61,16 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskCreateSerializer
         if self.action in ('update', 'partial_update'):
             return TaskUpdateSerializer
+        if self.action == 'list' and not self.expands_comments():
+            return TaskListSerializer
         return TaskSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('list', 'retrieve'):
+            kwargs.setdefault('fields', query_param_list(self.request, 'fields'))
+        return super().get_serializer(*args, **kwargs)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         task = serializer.save(assigned_by=self.request.user)
         # Send notification to assigned intern
@@ -53,11 +82,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             related_object_id=task.id,
             related_object_type='task',
         )
-        try:
-            from notifications.tasks import send_task_assignment_email
-            send_task_assignment_email.delay(task.id)
-        except Exception:
-            pass
+        defer_task('notifications.tasks.send_task_assignment_email', task.id)
 
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
@@ -89,7 +114,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def list_comments(self, request, pk=None):
         task = self.get_object()
-        comments = task.comments.all()
+        comments = task.comments.select_related('author')
         serializer = TaskCommentSerializer(comments, many=True)
         return Response(serializer.data)
 
@@ -100,7 +125,10 @@ class TaskViewSet(viewsets.ModelViewSet):
             due_date__lt=timezone.now().date(),
             status__in=['todo', 'in_progress']
         )
+        intern_ids = set(overdue_tasks.values_list('assigned_to_id', flat=True))
         count = overdue_tasks.update(status='overdue')
+        # Queryset update() sends no signals
+        invalidate_dashboards(intern_ids)
         return Response({'message': f'{count} tasks marked as overdue'})
 
     filterset_fields = ['status', 'priority', 'assigned_to', 'program']
@@ -1,23 +1,32 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { notificationsAPI } from '../services/api';
+import { useAuth } from '../context/AuthContext';
 
 const NotificationBell = () => {
   const [unreadCount, setUnreadCount] = useState(0);
   const [showDropdown, setShowDropdown] = useState(false);
   const dropdownRef = useRef(null);
+  const { takeBootstrap } = useAuth();
 
+  // The stream (or the 30s unread_count poll when streams are off) sends the
+  // current count on connect and again whenever it changes; right after sign-in
+  // the first count comes from the bootstrap response instead
   useEffect(() => {
-    const fetchCount = async () => {
-      try {
-        const response = await notificationsAPI.getUnreadCount();
-        setUnreadCount(response.data?.count || 0);
-      } catch (error) { /* silent */ }
+    let unsubscribe = () => {};
+    let cancelled = false;
+    takeBootstrap('unread_count').then((count) => {
+      if (cancelled) return;
+      if (count !== undefined) setUnreadCount(count);
+      unsubscribe = notificationsAPI.subscribeUnread((event, data) => {
+        if (event === 'unread') setUnreadCount(data.count || 0);
+      }, { seeded: count !== undefined });
+    });
+    return () => {
+      cancelled = true;
+      unsubscribe();
     };
-    fetchCount();
-    const interval = setInterval(fetchCount, 30000);
-    return () => clearInterval(interval);
-  }, []);
+  }, [takeBootstrap]);
 
   useEffect(() => {
     const handleClickOutside = (event) => {
@@ -1,5 +1,9 @@
-import React, { createContext, useContext, useReducer, useEffect } from 'react';
-import { login, logout, register, isAuthenticated, getUser } from '../services/auth';
+import React, { createContext, useContext, useReducer, useEffect, useRef, useCallback } from 'react';
+import { login, logout, register, isAuthenticated, getUser, setUser } from '../services/auth';
+import { dashboardAPI } from '../services/api';
+
+// Bootstrap parts older than this are left for the pages to fetch themselves
+const BOOTSTRAP_MAX_AGE = 30000;
 
 const AuthContext = createContext();
 
@@ -80,10 +84,34 @@ const initialState = {
 
 export const AuthProvider = ({ children }) => {
   const [state, dispatch] = useReducer(authReducer, initialState);
+  const bootstrapRef = useRef(null);
+
+  // One /bootstrap/ request per sign-in (or reload) seeds the first render of the
+  // dashboard, notification bell, attendance and leave pages. Each part is handed
+  // out once; later visits fetch their own endpoint so the data stays current.
+  const loadBootstrap = useCallback(() => {
+    const loadedAt = Date.now();
+    bootstrapRef.current = dashboardAPI.getBootstrap()
+      .then((response) => {
+        setUser(response.data.profile);
+        dispatch({ type: 'UPDATE_USER', payload: response.data.profile });
+        return { parts: { ...response.data }, loadedAt };
+      })
+      .catch(() => ({ parts: {}, loadedAt }));
+  }, []);
+
+  const takeBootstrap = useCallback(async (part) => {
+    if (!bootstrapRef.current) return undefined;
+    const { parts, loadedAt } = await bootstrapRef.current;
+    const value = parts[part];
+    delete parts[part];
+    return Date.now() - loadedAt <= BOOTSTRAP_MAX_AGE ? value : undefined;
+  }, []);
 
   useEffect(() => {
     const initializeAuth = () => {
       if (isAuthenticated()) {
+        loadBootstrap();
         const user = getUser();
         dispatch({
           type: 'LOGIN_SUCCESS',
@@ -95,7 +123,7 @@ export const AuthProvider = ({ children }) => {
     };
 
     initializeAuth();
-  }, []);
+  }, [loadBootstrap]);
 
   const handleLogin = async (credentials) => {
     dispatch({ type: 'SET_LOADING', payload: true });
@@ -103,6 +131,7 @@ export const AuthProvider = ({ children }) => {
 
     const result = await login(credentials);
     if (result.success) {
+      loadBootstrap();
       dispatch({
         type: 'LOGIN_SUCCESS',
         payload: { user: result.user, token: result.token },
@@ -122,6 +151,7 @@ export const AuthProvider = ({ children }) => {
 
     const result = await register(userData);
     if (result.success) {
+      loadBootstrap();
       dispatch({
         type: 'REGISTER_SUCCESS',
         payload: { user: result.user, token: result.token },
@@ -137,6 +167,7 @@ export const AuthProvider = ({ children }) => {
 
   const handleLogout = async () => {
     await logout();
+    bootstrapRef.current = null;
     dispatch({ type: 'LOGOUT' });
   };
 
@@ -155,6 +186,7 @@ export const AuthProvider = ({ children }) => {
     logout: handleLogout,
     updateUser,
     clearError,
+    takeBootstrap,
     isAdmin: state.user && state.user.role === 'admin',
     isSupervisor: state.user && state.user.role === 'supervisor',
   };
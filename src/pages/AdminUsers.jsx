@@ -9,11 +9,19 @@ const AdminUsers = () => {
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
   const [roleFilter, setRoleFilter] = useState('');
+  const [search, setSearch] = useState('');
+  const [page, setPage] = useState(1);
+  const [pagination, setPagination] = useState(null);
 
+  // Filtering, search and paging all happen server-side
   const fetchUsers = async () => {
     try {
-      const response = await accountsAPI.listUsers();
+      const params = { page };
+      if (roleFilter) params.role = roleFilter;
+      if (search.trim()) params.search = search.trim();
+      const response = await accountsAPI.listUsers(params);
       setUsers(Array.isArray(response.data) ? response.data : response.data?.results || []);
+      setPagination(response.pagination || null);
     } catch (error) {
       toast.error('Failed to load users');
     } finally {
@@ -21,7 +29,10 @@ const AdminUsers = () => {
     }
   };
 
-  useEffect(() => { fetchUsers(); }, []);
+  useEffect(() => {
+    const timer = setTimeout(fetchUsers, 300);
+    return () => clearTimeout(timer);
+  }, [page, roleFilter, search]);
 
   const handleRoleChange = async (userId, newRole) => {
     try {
@@ -43,10 +54,6 @@ const AdminUsers = () => {
     }
   };
 
-  const filteredUsers = roleFilter
-    ? users.filter(u => u.role === roleFilter)
-    : users;
-
   if (loading) return <Layout><LoadingSpinner /></Layout>;
 
   return (
@@ -54,14 +61,17 @@ const AdminUsers = () => {
       <div className="space-y-6">
         <h2 className="text-2xl font-bold text-gray-900">User Management</h2>
 
-        {/* Role Filter */}
-        <div className="flex gap-2">
+        {/* Role Filter and Search */}
+        <div className="flex flex-wrap items-center gap-2">
           {['', 'intern', 'supervisor', 'admin'].map((r) => (
-            <button key={r} onClick={() => setRoleFilter(r)}
+            <button key={r} onClick={() => { setRoleFilter(r); setPage(1); }}
               className={`px-3 py-1.5 rounded-lg text-sm font-medium transition ${roleFilter === r ? 'bg-blue-600 text-white' : 'bg-gray-100 text-gray-600 hover:bg-gray-200'}`}>
               {r === '' ? 'All' : r.charAt(0).toUpperCase() + r.slice(1)}
             </button>
           ))}
+          <input type="search" value={search} placeholder="Search name or email"
+            onChange={(e) => { setSearch(e.target.value); setPage(1); }}
+            className="ml-auto text-sm border border-gray-300 rounded-lg px-3 py-1.5 focus:ring-blue-500 focus:border-blue-500" />
         </div>
 
         {/* Users Table */}
@@ -77,7 +87,7 @@ const AdminUsers = () => {
               </tr>
             </thead>
             <tbody className="divide-y divide-gray-200">
-              {filteredUsers.map((u) => (
+              {users.map((u) => (
                 <tr key={u.id} className={!u.is_active ? 'bg-gray-50' : ''}>
                   <td className="px-6 py-4 text-sm font-medium text-gray-900">{u.first_name} {u.last_name}</td>
                   <td className="px-6 py-4 text-sm text-gray-500">{u.email}</td>
@@ -105,6 +115,20 @@ const AdminUsers = () => {
             </tbody>
           </table>
         </div>
+
+        {/* Pagination */}
+        {pagination && (
+          <div className="flex items-center justify-between text-sm text-gray-600">
+            <span>{pagination.count} user{pagination.count !== 1 ? 's' : ''}</span>
+            <div className="flex gap-2">
+              <button onClick={() => setPage(page - 1)} disabled={!pagination.previous}
+                className="px-3 py-1.5 rounded-lg bg-gray-100 hover:bg-gray-200 disabled:opacity-50">Previous</button>
+              <span className="px-2 py-1.5">Page {page}</span>
+              <button onClick={() => setPage(page + 1)} disabled={!pagination.next}
+                className="px-3 py-1.5 rounded-lg bg-gray-100 hover:bg-gray-200 disabled:opacity-50">Next</button>
+            </div>
+          </div>
+        )}
       </div>
     </Layout>
   );
@@ -12,7 +12,7 @@ import { useAuth } from '../context/AuthContext';
 const Attendance = () => {
   const { token: urlToken } = useParams();
   const [searchParams] = useSearchParams();
-  const { user } = useAuth();
+  const { user, takeBootstrap } = useAuth();
   const isAdminOrSupervisor = user?.role === 'admin' || user?.role === 'supervisor';
 
   const [records, setRecords] = useState([]);
@@ -32,10 +32,11 @@ const Attendance = () => {
 
   const fetchData = async () => {
     try {
+      const bootstrapStatus = await takeBootstrap('today_status');
       const [recordsRes, summaryRes, statusRes] = await Promise.all([
         attendanceAPI.getRecords(),
         attendanceAPI.getWeeklySummary(),
-        attendanceAPI.getTodayStatus(),
+        bootstrapStatus ? { data: bootstrapStatus } : attendanceAPI.getTodayStatus(),
       ]);
       setRecords(Array.isArray(recordsRes.data) ? recordsRes.data : recordsRes.data?.results || []);
       setSummary(summaryRes.data);
@@ -65,6 +66,13 @@ const Attendance = () => {
     if (isAdminOrSupervisor) fetchActiveQR();
   }, []);
 
+  // Rotating codes: refresh the displayed code when it rotates
+  useEffect(() => {
+    if (!activeQR?.code_expires_in) return;
+    const timer = setTimeout(fetchActiveQR, activeQR.code_expires_in * 1000);
+    return () => clearTimeout(timer);
+  }, [activeQR?.code]);
+
   // Auto-scan from URL token
   useEffect(() => {
     const token = urlToken || searchParams.get('token');
@@ -162,7 +170,7 @@ const Attendance = () => {
   // Build QR scan URL using the current hostname (not localhost) so phones on the same network can reach it
   const baseUrl = `${window.location.protocol}//${window.location.host}`;
   const qrScanUrl = activeQR
-    ? `${baseUrl}/attendance/scan/${activeQR.token}`
+    ? `${baseUrl}/attendance/scan/${activeQR.code || activeQR.token}`
     : '';
 
   return (
@@ -4,16 +4,19 @@ import { toast } from 'react-toastify';
 import Layout from '../components/Layout';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { dashboardAPI } from '../services/api';
+import { useAuth } from '../context/AuthContext';
 
 const InternDashboard = () => {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
+  const { user, takeBootstrap } = useAuth();
 
   useEffect(() => {
     const fetchDashboard = async () => {
       try {
-        const response = await dashboardAPI.getInternDashboard();
-        setData(response.data);
+        // Right after sign-in the bootstrap response already carries it
+        const dashboard = user?.role === 'intern' ? await takeBootstrap('dashboard') : undefined;
+        setData(dashboard || (await dashboardAPI.getInternDashboard()).data);
       } catch (error) {
         toast.error('Failed to load dashboard');
       } finally {
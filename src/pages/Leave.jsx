@@ -26,7 +26,7 @@ const STATUS_LABELS = {
 const extractList = (res) => Array.isArray(res.data) ? res.data : res.data?.results || [];
 
 const Leave = () => {
-  const { user } = useAuth();
+  const { user, takeBootstrap } = useAuth();
   const isSupervisor = user?.role === 'supervisor';
   const isAdmin = user?.role === 'admin';
   const canManageLeave = isSupervisor || isAdmin;
@@ -50,10 +50,11 @@ const Leave = () => {
 
   const fetchData = useCallback(async () => {
     try {
+      const bootstrapBalance = await takeBootstrap('leave_balance');
       const [requestsRes, typesRes, balanceRes] = await Promise.all([
         canManageLeave ? leaveAPI.getLeaveRequests() : leaveAPI.getMyLeaveRequests(),
         leaveAPI.getLeaveTypes(),
-        leaveAPI.getLeaveBalance(),
+        bootstrapBalance ? { data: bootstrapBalance } : leaveAPI.getLeaveBalance(),
       ]);
       setLeaveRequests(extractList(requestsRes));
       setLeaveTypes(extractList(typesRes));
@@ -63,7 +64,7 @@ const Leave = () => {
     } finally {
       setLoading(false);
     }
-  }, [canManageLeave]);
+  }, [canManageLeave, takeBootstrap]);
 
   useEffect(() => { fetchData(); }, [fetchData]);
 
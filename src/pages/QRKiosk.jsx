@@ -27,14 +27,14 @@ const QRKiosk = () => {
         setScanCount(res.data.scan_count || 0);
       } else {
         // No active QR — generate one
-        const genRes = await attendanceAPI.generateQR('AM');
+        const genRes = await attendanceAPI.generateQR('AM', true);
         setActiveQR(genRes.data);
         setScanCount(0);
       }
     } catch (error) {
       // Try generating if fetch failed
       try {
-        const genRes = await attendanceAPI.generateQR('AM');
+        const genRes = await attendanceAPI.generateQR('AM', true);
         setActiveQR(genRes.data);
         setScanCount(0);
       } catch (err) {
@@ -47,29 +47,26 @@ const QRKiosk = () => {
 
   useEffect(() => { initQR(); }, [initQR]);
 
-  // Poll for scan count updates every 10 seconds
+  // Live updates: new/deactivated tokens, rotated codes and scan count ticks
   useEffect(() => {
-    const poll = setInterval(async () => {
-      try {
-        const res = await attendanceAPI.getActiveQR();
-        if (res.data && res.data.token) {
-          setScanCount(res.data.scan_count || 0);
-          if (res.data.scan_count > (activeQR?.scan_count || 0)) {
-            setRecentScans(prev => [
-              { time: new Date(), count: res.data.scan_count },
-              ...prev.slice(0, 4)
-            ]);
-          }
-          setActiveQR(res.data);
-        }
-      } catch (error) { /* silent */ }
-    }, 10000);
-    return () => clearInterval(poll);
-  }, [activeQR?.scan_count]);
+    const unsubscribe = attendanceAPI.subscribeQR((event, data) => {
+      if (event === 'qr') {
+        setActiveQR(data.token ? data : null);
+        if (data.token) setScanCount(data.scan_count || 0);
+      } else if (event === 'scan') {
+        setScanCount(data.scan_count);
+        setRecentScans(prev => [
+          { time: new Date(), count: data.scan_count },
+          ...prev.slice(0, 4)
+        ]);
+      }
+    });
+    return unsubscribe;
+  }, []);
 
   const baseUrl = `${window.location.protocol}//${window.location.host}`;
   const qrScanUrl = activeQR
-    ? `${baseUrl}/attendance/scan/${activeQR.token}`
+    ? `${baseUrl}/attendance/scan/${activeQR.code || activeQR.token}`
     : '';
 
   const currentHour = currentTime.getHours();
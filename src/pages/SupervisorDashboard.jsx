@@ -4,17 +4,20 @@ import { toast } from 'react-toastify';
 import Layout from '../components/Layout';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { dashboardAPI, leaveAPI } from '../services/api';
+import { useAuth } from '../context/AuthContext';
 
 const SupervisorDashboard = () => {
   const [data, setData] = useState(null);
   const [pendingLeaveCount, setPendingLeaveCount] = useState(0);
   const [loading, setLoading] = useState(true);
+  const { user, takeBootstrap } = useAuth();
 
   useEffect(() => {
     const fetchDashboard = async () => {
       try {
-        const response = await dashboardAPI.getSupervisorDashboard();
-        setData(response.data);
+        // Right after sign-in the bootstrap response already carries it
+        const dashboard = user?.role === 'supervisor' ? await takeBootstrap('dashboard') : undefined;
+        setData(dashboard || (await dashboardAPI.getSupervisorDashboard()).data);
       } catch (error) {
         toast.error('Failed to load dashboard');
       } finally {
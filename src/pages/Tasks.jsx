@@ -59,9 +59,7 @@ const Tasks = () => {
     setInternsLoading(true);
     try {
       if (user.role === 'admin') {
-        const usersRes = await accountsAPI.listUsers();
-        const allUsers = extractList(usersRes);
-        setInterns(allUsers.filter(u => u.role === 'intern' && u.is_active));
+        setInterns(await accountsAPI.listAllUsers({ role: 'intern', is_active: true }));
       } else if (user.role === 'supervisor') {
         // Backend returns UserListSerializer data (id, first_name, last_name, email, etc.)
         const res = await accountsAPI.getMySupervisorInterns();
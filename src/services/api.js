@@ -52,6 +52,83 @@ const handleResponse = (response) => {
   return response;
 };
 
+// Server-sent events over fetch (EventSource cannot send the auth header).
+// Reconnects when the server ends the stream; returns a function that closes it.
+// When the server has streams disabled (503), calls fallback.poll(onEvent)
+// every fallback.interval ms instead (the first call waits one interval when
+// fallback.delayFirst is set), and later subscriptions go straight to polling.
+let streamsUnavailable = false;
+
+export const subscribeEvents = (path, onEvent, fallback) => {
+  let controller = null;
+  let timer = null;
+  let closed = false;
+
+  const poll = async () => {
+    try {
+      await fallback.poll(onEvent);
+    } catch (error) { /* silent */ }
+    if (!closed) timer = setTimeout(poll, fallback.interval);
+  };
+
+  const startPolling = () => {
+    if (fallback.delayFirst) timer = setTimeout(poll, fallback.interval);
+    else poll();
+  };
+
+  const connect = async () => {
+    if (streamsUnavailable && fallback) {
+      startPolling();
+      return;
+    }
+    controller = new AbortController();
+    try {
+      const response = await fetch(`${API_BASE_URL}${path}`, {
+        headers: {
+          Accept: 'text/event-stream',
+          Authorization: `Token ${localStorage.getItem('token')}`,
+        },
+        signal: controller.signal,
+      });
+      if (response.status === 503 && fallback) {
+        streamsUnavailable = true;
+        startPolling();
+        return;
+      }
+      if (!response.ok) throw new Error(`Stream failed with ${response.status}`);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop();
+        frames.forEach((frame) => {
+          let event = 'message';
+          let data = '';
+          frame.split('\n').forEach((line) => {
+            if (line.startsWith('event: ')) event = line.slice(7);
+            else if (line.startsWith('data: ')) data += line.slice(6);
+          });
+          if (data) onEvent(event, JSON.parse(data));
+        });
+      }
+    } catch (error) {
+      if (closed) return;
+    }
+    if (!closed) timer = setTimeout(connect, 3000);
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(timer);
+    if (controller) controller.abort();
+  };
+};
+
 // Auth services
 export const authAPI = {
   register: (userData) => api.post('/auth/register/', userData).then(handleResponse),
@@ -69,7 +146,16 @@ export const accountsAPI = {
   requestPasswordReset: (emailData) => api.post('/auth/password-reset/', emailData).then(handleResponse),
   confirmPasswordReset: (resetData) => api.post('/auth/password-reset/confirm/', resetData).then(handleResponse),
   validateResetToken: (token) => api.get(`/auth/password-reset/validate/${token}/`).then(handleResponse),
-  listUsers: () => api.get('/auth/users/').then(handleResponse),
+  listUsers: (params = {}) => api.get('/auth/users/', { params }).then(handleResponse),
+  // Walks every page, for pickers that need the complete list
+  listAllUsers: async (params = {}) => {
+    const users = [];
+    for (let page = 1; ; page += 1) {
+      const res = await api.get('/auth/users/', { params: { ...params, page, page_size: 500 } }).then(handleResponse);
+      users.push(...res.data);
+      if (!res.pagination?.next) return users;
+    }
+  },
   updateUserRole: (userId, data) => api.put(`/auth/users/${userId}/role/`, data).then(handleResponse),
   deactivateUser: (userId) => api.post(`/auth/users/${userId}/deactivate/`).then(handleResponse),
   getSupervisorAssignments: () => api.get('/auth/supervisor-assignments/').then(handleResponse),
@@ -129,6 +215,15 @@ export const notificationsAPI = {
   markRead: (ids) => api.post('/notifications/mark_read/', { ids }).then(handleResponse),
   markAllRead: () => api.post('/notifications/mark_all_read/').then(handleResponse),
   getUnreadCount: () => api.get('/notifications/unread_count/').then(handleResponse),
+  // seeded: the caller already has a current count, so polling can wait a round
+  subscribeUnread: (onEvent, { seeded = false } = {}) => subscribeEvents('/notifications/unread_stream/', onEvent, {
+    interval: 30000,
+    delayFirst: seeded,
+    poll: async (emit) => {
+      const { data } = await api.get('/notifications/unread_count/');
+      emit('unread', data);
+    },
+  }),
 };
 
 // Attendance services
@@ -139,10 +234,25 @@ export const attendanceAPI = {
   getDailySummary: (date) => api.get(`/attendance/daily_summary/?date=${date}`).then(handleResponse),
   getWeeklySummary: () => api.get('/attendance/weekly_summary/').then(handleResponse),
   getTodayStatus: () => api.get('/attendance/today_status/').then(handleResponse),
-  generateQR: (period = 'AM') => api.post('/attendance/generate_qr/', { period }).then(handleResponse),
+  generateQR: (period = 'AM', rotating = false) => api.post('/attendance/generate_qr/', { period, rotating }).then(handleResponse),
   qrScan: (token) => api.post('/attendance/qr_scan/', { token }).then(handleResponse),
   getActiveQR: () => api.get('/attendance/active_qr/').then(handleResponse),
   deactivateQR: () => api.post('/attendance/deactivate_qr/').then(handleResponse),
+  // Falls back to polling active_qr, well inside the rotating code's grace window
+  subscribeQR: (onEvent) => {
+    let lastScanCount = null;
+    return subscribeEvents('/attendance/qr_stream/', onEvent, {
+      interval: 10000,
+      poll: async (emit) => {
+        const { data } = await api.get('/attendance/active_qr/');
+        emit('qr', data);
+        if (data.token && lastScanCount !== null && data.scan_count > lastScanCount) {
+          emit('scan', { scan_count: data.scan_count });
+        }
+        lastScanCount = data.token ? data.scan_count : null;
+      },
+    });
+  },
 };
 
 // Leave services
@@ -157,6 +267,7 @@ export const leaveAPI = {
   supervisorRejectLeave: (id, data) => api.post(`/leave-requests/${id}/supervisor_reject/`, data).then(handleResponse),
   supervisorCommentLeave: (id, data) => api.post(`/leave-requests/${id}/supervisor_comment/`, data).then(handleResponse),
   getLeaveBalance: () => api.get('/leave-requests/leave_balance/').then(handleResponse),
+  getInternLeaveBalances: (params) => api.get('/leave-requests/intern_balances/', { params }).then(handleResponse),
 };
 
 // Tasks services
@@ -194,6 +305,8 @@ export const dashboardAPI = {
   getInternDashboard: () => api.get('/dashboard/intern/').then(handleResponse),
   getSupervisorDashboard: () => api.get('/dashboard/supervisor/').then(handleResponse),
   getAdminReports: () => api.get('/reports/').then(handleResponse),
+  // Profile, unread count, dashboard, today's attendance and leave balances in one request
+  getBootstrap: () => api.get('/bootstrap/').then(handleResponse),
 };
 
 // Utility functions